@@ -5,6 +5,8 @@ PROJECT_NAME=hasker
 PROJECT_FOLDER=$(pwd)
 SECRET_KEY="$(openssl rand -base64 50)"
 CONFIG="hasker.settings.production"
+# Application server: "uwsgi" (WSGI) or "uvicorn" (ASGI mode)
+SERVER=${SERVER:-uwsgi}
 
 # Postgres settings
 DB_NAME=${PROJECT_NAME}_db
@@ -64,6 +66,19 @@ env=DB_USER=${DB_USER}
 env=DB_PASSWORD=${DB_PASSWORD}
 EOF
 
+APP_LOCATION="uwsgi_pass unix:/run/uwsgi/${PROJECT_NAME}.sock;
+        include uwsgi_params;"
+if [ "${SERVER}" = "uvicorn" ]; then
+    mkdir -p /run/uvicorn
+    # Server-Sent Events streams must not be buffered or cut by timeout
+    APP_LOCATION="proxy_pass http://unix:/run/uvicorn/${PROJECT_NAME}.sock;
+        proxy_http_version 1.1;
+        proxy_set_header Host \$host;
+        proxy_set_header Connection \"\";
+        proxy_buffering off;
+        proxy_read_timeout 1h;"
+fi
+
 
 echo "6. Configure nginx..."
 mkdir /var/www/static
@@ -84,15 +99,15 @@ server {
         root /var/www;
     }
     location / {
-        uwsgi_pass unix:/run/uwsgi/${PROJECT_NAME}.sock;
-        include uwsgi_params;
+        ${APP_LOCATION}
     }
 }
 EOF
 
 
 echo "6. Prepare Django..."
-COMMANDS=('collectstatic' 'makemigrations' 'migrate')
+# Existing databases have tables of initial migrations
+COMMANDS=('collectstatic' 'migrate --fake-initial')
 for COMMAND in "${COMMANDS[@]}"
 do
     DJANGO_SETTINGS_MODULE=${CONFIG} \
@@ -105,5 +120,16 @@ done
 
 
 echo "8. Start nginx..."
-uwsgi --ini /usr/local/etc/uwsgi.ini &
+if [ "${SERVER}" = "uvicorn" ]; then
+    # One worker: live events are delivered within a process
+    DJANGO_SETTINGS_MODULE=${CONFIG} \
+    SECRET_KEY=${SECRET_KEY} \
+    DB_NAME=${DB_NAME} \
+    DB_USER=${DB_USER} \
+    DB_PASSWORD=${DB_PASSWORD} \
+    uvicorn ${PROJECT_NAME}.asgi:application --workers 1 \
+        --uds /run/uvicorn/${PROJECT_NAME}.sock &
+else
+    uwsgi --ini /usr/local/etc/uwsgi.ini &
+fi
 service nginx start
\ No newline at end of file
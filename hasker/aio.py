@@ -0,0 +1,37 @@
+"""
+Thread offloading of blocking (database) calls for async code.
+
+Django 2.2 ORM is synchronous only, so coroutines run ORM calls in
+a shared pool of ASGI_THREADS threads. Database connections of
+a pool thread are closed or recycled after every call like after
+a request.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASGI_THREADS, thread_name_prefix="hasker"
+        )
+    return _executor
+
+
+def run_in_thread(func, *args, **kwargs):
+    """Run blocking func in the pool, return awaitable result"""
+    def call():
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    loop = asyncio.get_event_loop()
+    return loop.run_in_executor(get_executor(), call)
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from hasker.question.paginator import (
+    CachedCountPaginator, KeysetPaginator, is_cursor_mode
+)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Page number pagination with cached counts, switched to keyset
+    pagination (next/previous cursors, no count) in cursor mode
+    """
+    django_paginator_class = CachedCountPaginator
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = is_cursor_mode(request.query_params)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        try:
+            self.page = KeysetPaginator(queryset, page_size).page(
+                request.query_params.get(self.cursor_query_param)
+            )
+        except InvalidPage as e:
+            raise NotFound(str(e))
+        return list(self.page)
+
+    def get_cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        return Response(OrderedDict([
+            ("next", self.get_cursor_link(self.page.next_cursor)),
+            ("previous", self.get_cursor_link(self.page.previous_cursor)),
+            ("results", data)
+        ]))
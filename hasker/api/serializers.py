@@ -1,19 +1,54 @@
+from collections import OrderedDict
+
+from django.urls import reverse
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
 from hasker.question.models import Question, Answer
+from hasker.question.paginator import KeysetPaginator
+from hasker.user.models import User
 
 
-class QuestionListSerializer(serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(
-        view_name="api:question:detail", lookup_url_kwarg="q_id"
-    )
+class SparseFieldsetMixin:
+    """
+    Serializer with only fields named in context["fields"], if it's
+    not given - default_fields (all fields if None)
+    """
+    default_fields = None
+
+    def get_all_fields(self):
+        return super().get_fields()
+
+    def get_fields(self):
+        fields = self.get_all_fields()
+        names = self.context.get("fields") or self.default_fields
+        if names is None:
+            return fields
+        return OrderedDict(
+            (name, field) for name, field in fields.items() if name in names
+        )
+
+
+class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
-        model = Question
-        fields = ("id", "url", )
+        model = User
+        fields = ("username", "avatar", "registered")
+
+
+class ExpandAuthorMixin:
+    """Author as a nested user object, if it's in context["expand"]"""
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if "author" in fields and "author" in self.context.get("expand", ()):
+            fields["author"] = UserSerializer(read_only=True)
+        return fields
 
-class QuestionSerializer(serializers.HyperlinkedModelSerializer):
+
+class QuestionSerializer(ExpandAuthorMixin, SparseFieldsetMixin,
+                         serializers.HyperlinkedModelSerializer):
     author = serializers.SlugRelatedField(
         many=False, read_only=True, slug_field="username"
     )
@@ -24,7 +59,7 @@ class QuestionSerializer(serializers.HyperlinkedModelSerializer):
         many=False, read_only=True,
         view_name="api:question:answers", lookup_url_kwarg="q_id"
     )
-    answers_count = serializers.SerializerMethodField()
+    votes = serializers.IntegerField(source="score", read_only=True)
 
     class Meta:
         model = Question
@@ -33,14 +68,59 @@ class QuestionSerializer(serializers.HyperlinkedModelSerializer):
             "tags", "answers", "answers_count"
         )
 
-    def get_answers_count(self, question):
-        return question.answers.count()
+    def get_fields(self):
+        fields = super().get_fields()
+        if "answers" in fields and "answers" in self.context.get("expand", ()):
+            fields["answers"] = serializers.SerializerMethodField(
+                method_name="get_answers_page"
+            )
+        return fields
+
+    def get_answers_page(self, question):
+        """
+        First page of answers and url of the next one, ordered like
+        AnswerListView, so its cursor pagination continues the page
+        """
+        page = KeysetPaginator(
+            question.answers.select_related("author"), api_settings.PAGE_SIZE
+        ).page()
+
+        next_url = None
+        if page.next_cursor:
+            next_url = replace_query_param(
+                self.context["request"].build_absolute_uri(reverse(
+                    "api:question:answers", kwargs={"q_id": question.pk}
+                )),
+                "cursor", page.next_cursor
+            )
 
+        # Requested fields are question fields
+        context = dict(self.context, fields=None)
+        return OrderedDict([
+            ("next", next_url),
+            ("results", AnswerSerializer(
+                page.object_list, many=True, context=context
+            ).data),
+        ])
 
-class AnswerSerializer(serializers.HyperlinkedModelSerializer):
+
+class QuestionListSerializer(QuestionSerializer):
+    """Id and url of a question, any question fields on request"""
+    url = serializers.HyperlinkedIdentityField(
+        view_name="api:question:detail", lookup_url_kwarg="q_id"
+    )
+    default_fields = ("id", "url")
+
+    class Meta(QuestionSerializer.Meta):
+        fields = ("id", "url") + QuestionSerializer.Meta.fields[1:]
+
+
+class AnswerSerializer(ExpandAuthorMixin, SparseFieldsetMixin,
+                       serializers.HyperlinkedModelSerializer):
     author = serializers.SlugRelatedField(
         many=False, read_only=True, slug_field="username"
     )
+    votes = serializers.IntegerField(source="score", read_only=True)
 
     class Meta:
         model = Answer
@@ -48,3 +128,8 @@ class AnswerSerializer(serializers.HyperlinkedModelSerializer):
             "id", "text", "author", "published", "votes",
         )
 
+
+class VoteSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=("q", "a"))
+    id = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=("like", "dislike"))
@@ -1,3 +1,8 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -14,6 +19,7 @@ class ViewsTest(APITestCase):
 
     def setUp(self):
         super().setUp()
+        cache.clear()
         good_credentials = {
             "username": "test_user",
             "password": "U_!ASDsa123lk"
@@ -66,6 +72,19 @@ class ViewsTest(APITestCase):
             response.data["results"][0]["url"]
         )
 
+    def test_index_page_cursor(self):
+        url = reverse("api:question:index")
+        response = self.client.get(url, {"cursor": ""}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(
+            response.data["results"][0]["id"], self.test_question.id
+        )
+
+        response = self.client.get(url, {"cursor": "bad"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_hot_page(self):
         url = reverse("api:question:hot")
         response = self.client.get(url, format="json")
@@ -172,6 +191,191 @@ class ViewsTest(APITestCase):
             response.data["results"][0]["votes"], self.test_answer.votes
         )
 
+    def test_detail_page_not_modified(self):
+        urls = [
+            reverse(
+                "api:question:detail", kwargs={"q_id": self.test_question.id}
+            ),
+            reverse(
+                "api:question:answers", kwargs={"q_id": self.test_question.id}
+            ),
+        ]
+        for url in urls:
+            response = self.client.get(url, format="json")
+            response = self.client.get(
+                url, format="json", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_304_NOT_MODIFIED
+            )
+
+    def test_etag_of_representation(self):
+        url = reverse(
+            "api:question:detail", kwargs={"q_id": self.test_question.id}
+        )
+        etag = self.client.get(url, format="json")["ETag"]
+        self.assertNotEqual(
+            self.client.get(url, {"fields": "id"}, format="json")["ETag"],
+            etag
+        )
+        self.assertNotEqual(
+            self.client.get(url, HTTP_ACCEPT="text/html")["ETag"], etag
+        )
+        # Expanded author avatar isn't covered by question dates
+        response = self.client.get(url, {"expand": "author"}, format="json")
+        self.assertFalse(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_detail_page_num_queries(self):
+        url = reverse(
+            "api:question:detail", kwargs={"q_id": self.test_question.id}
+        )
+        for i in range(3):
+            self.test_question.tags.create(name="tag{}".format(i))
+            # auth user, validators, question, tags
+            with self.assertNumQueries(4):
+                self.client.get(url, format="json")
+
+    def test_answers_page_num_queries(self):
+        url = reverse(
+            "api:question:answers", kwargs={"q_id": self.test_question.id}
+        )
+        for i in range(3):
+            author = User.objects.create_user(username="author{}".format(i))
+            self.test_question.answers.create(text="answer", author=author)
+            cache.clear()
+            # auth user, validators, question, count, answers
+            with self.assertNumQueries(5):
+                self.client.get(url, format="json")
+
+    def test_detail_page_fields(self):
+        url = reverse(
+            "api:question:detail", kwargs={"q_id": self.test_question.id}
+        )
+        self.test_question.tags.create(name="tag")
+        # auth user, validators, question without text and author join
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                url, {"fields": "id,title,votes"}, format="json"
+            )
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('"text"', queries[-1]["sql"])
+        self.assertNotIn("JOIN", queries[-1]["sql"])
+        self.assertEqual(response.data, {
+            "id": self.test_question.id,
+            "title": self.test_question.title,
+            "votes": 0,
+        })
+
+        response = self.client.get(
+            url, {"fields": "author,tags"}, format="json"
+        )
+        self.assertEqual(
+            response.data, {"author": "test_user", "tags": ["tag"]}
+        )
+
+    def test_list_pages_fields(self):
+        for url in self.test_pages[:3]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    url, {"fields": "title,answers_count"}, format="json"
+                )
+            self.assertEqual(response.data["results"], [{
+                "title": "question title", "answers_count": 1
+            }])
+            for query in queries:
+                self.assertNotIn('"question_question"."text"', query["sql"])
+
+        response = self.client.get(
+            self.test_pages[0], {"fields": "id,tags", "cursor": ""},
+            format="json"
+        )
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.test_question.id, "tags": []}]
+        )
+
+        url = reverse(
+            "api:question:answers", kwargs={"q_id": self.test_question.id}
+        )
+        response = self.client.get(url, {"fields": "id,author"})
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.test_answer.id, "author": "test_user"}]
+        )
+
+    def test_unknown_fields(self):
+        for url in self.test_pages:
+            response = self.client.get(
+                url, {"fields": "id,password"}, format="json"
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertIn("password", response.data["fields"])
+
+    @override_settings(
+        REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, PAGE_SIZE=2)
+    )
+    def test_detail_page_expand(self):
+        url = reverse(
+            "api:question:detail", kwargs={"q_id": self.test_question.id}
+        )
+        response = self.client.get(
+            url, {"expand": "answers,author"}, format="json"
+        )
+        self.assertEqual(response.data["author"]["username"], "test_user")
+        self.assertIsNone(response.data["answers"]["next"])
+        self.assertEqual(response.data["answers"]["results"], [{
+            "id": self.test_answer.id,
+            "text": "answer text",
+            "author": {
+                "username": "test_user",
+                "avatar": None,
+                "registered": DateTimeField().to_representation(
+                    self.test_user.registered
+                ),
+            },
+            "published": DateTimeField().to_representation(
+                self.test_answer.published
+            ),
+            "votes": 0,
+        }])
+
+        for i in range(2):
+            author = User.objects.create_user(username="author{}".format(i))
+            self.test_question.answers.create(text="answer", author=author)
+            # auth user, question with author, tags, answers, expanded
+            # responses skip conditional checks
+            with self.assertNumQueries(4):
+                response = self.client.get(
+                    url, {"expand": "answers,author"}, format="json"
+                )
+
+        answers = response.data["answers"]
+        self.assertEqual(len(answers["results"]), 2)
+        response = self.client.get(answers["next"], format="json")
+        self.assertEqual(
+            [answer["id"] for answer in answers["results"]] +
+            [answer["id"] for answer in response.data["results"]],
+            list(self.test_question.answers.values_list("id", flat=True))
+        )
+
+    def test_detail_page_expand_fields(self):
+        url = reverse(
+            "api:question:detail", kwargs={"q_id": self.test_question.id}
+        )
+        response = self.client.get(
+            url, {"expand": "answers", "fields": "id"}, format="json"
+        )
+        self.assertEqual(list(response.data), ["id", "answers"])
+        self.assertEqual(
+            response.data["answers"]["results"][0]["author"], "test_user"
+        )
+
+        response = self.client.get(url, {"expand": "tags"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_answers_page_not_exist_id(self):
         url = reverse(
             "api:question:answers", kwargs={"q_id": 0}
@@ -179,3 +383,91 @@ class ViewsTest(APITestCase):
         response = self.client.get(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response['content-type'], 'application/json')
+
+
+class BatchVoteTest(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        credentials = {
+            "username": "voter",
+            "password": "U_!ASDsa123lk"
+        }
+        self.voter = User.objects.create_user(**credentials)
+        self.author = User.objects.create_user(
+            username="author", password="U_!ASDsa123lk"
+        )
+        self.question = self.author.question_set.create(
+            title="question title",
+            text="question text"
+        )
+        self.answer = self.question.answers.create(
+            text="answer text",
+            author=self.author
+        )
+        self.own_question = self.voter.question_set.create(
+            title="own question title",
+            text="own question text"
+        )
+
+        url = reverse("api:token:token_obtain_pair")
+        response = self.client.post(url, credentials, format="json")
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(response.json()["access"])
+        )
+        self.url = reverse("api:votes")
+
+    def test_batch_vote(self):
+        response = self.client.post(self.url, [
+            {"type": "q", "id": self.question.id, "action": "like"},
+            {"type": "a", "id": self.answer.id, "action": "like"},
+            {"type": "a", "id": self.answer.id, "action": "dislike"},
+        ], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(response.data, [
+            {"type": "q", "id": self.question.id, "votes": 1},
+            {"type": "a", "id": self.answer.id, "votes": -1},
+        ])
+        self.answer.refresh_from_db()
+        self.assertEqual(
+            (self.answer.likes, self.answer.dislikes), (0, 1)
+        )
+
+    def test_batch_vote_toggle(self):
+        self.question.vote(self.voter, like=True)
+        response = self.client.post(self.url, [
+            {"type": "q", "id": self.question.id, "action": "like"},
+        ], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["votes"], 0)
+        self.assertFalse(self.question.vote_set.exists())
+
+    def test_batch_vote_own_object(self):
+        response = self.client.post(self.url, [
+            {"type": "q", "id": self.question.id, "action": "like"},
+            {"type": "q", "id": self.own_question.id, "action": "like"},
+        ], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(self.question.vote_set.exists())
+
+    def test_batch_vote_not_exist_id(self):
+        response = self.client.post(self.url, [
+            {"type": "a", "id": 0, "action": "like"},
+        ], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_vote_bad_data(self):
+        response = self.client.post(self.url, [
+            {"type": "bad", "id": self.question.id, "action": "like"},
+        ], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_vote_not_authenticated(self):
+        self.client.credentials()
+        response = self.client.post(self.url, [
+            {"type": "q", "id": self.question.id, "action": "like"},
+        ], format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -31,5 +31,6 @@ swagger_view = get_swagger_view("Hasker REST API")
 urlpatterns = [
     path("token/", include(token_patterns)),
     path("questions/", include(questions_patterns)),
+    path("votes/", views.BatchVoteView.as_view(), name="votes"),
     path("schema/", swagger_view)
 ]
@@ -1,85 +1,214 @@
-from django.db.models import F, Q, Count
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 
 from rest_framework import generics
+from rest_framework.exceptions import ValidationError, PermissionDenied
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
 
-from hasker.question.views import Question
+from hasker.question.search import search_questions
+from hasker.question.views import Question, Answer, question_condition
 from . import serializers
 
 
-class IndexQuestionListView(generics.ListAPIView):
+class SparseFieldsetViewMixin:
+    """
+    "fields" query parameter: comma-separated names of serializer
+    fields to return. Queryset loads only columns of the returned
+    fields and joins or prefetches only their relations.
+    """
+    fields_query_param = "fields"
+    # Columns loaded whatever fields are requested
+    required_fields = ()
+
+    def get_requested_fields(self):
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = None
+            value = self.request.query_params.get(self.fields_query_param)
+            if value:
+                names = [name.strip() for name in value.split(",")]
+                names = [name for name in names if name]
+                available = self.get_serializer_class()(
+                    context=super().get_serializer_context()
+                ).get_all_fields()
+                unknown = [name for name in names if name not in available]
+                if unknown:
+                    raise ValidationError({
+                        self.fields_query_param:
+                            "Unknown fields: {}".format(", ".join(unknown))
+                    })
+                self._requested_fields = names
+        return self._requested_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        opts = queryset.model._meta
+
+        only = {opts.pk.name, *self.required_fields}
+        select_related, prefetch_related = [], []
+        for field in self.get_serializer().fields.values():
+            # Identity fields (urls) need only pk
+            if field.source == "*":
+                continue
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                # Property or annotation, its columns are unknown
+                return queryset
+
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch_related.append(field.source)
+            elif model_field.is_relation and hasattr(field, "slug_field"):
+                select_related.append(field.source)
+                only.add(field.source)
+                only.add("{}__{}".format(field.source, field.slug_field))
+            elif isinstance(field, BaseSerializer):
+                # Nested object, e.g. expanded author
+                select_related.append(field.source)
+                only.add(field.source)
+                only.update(
+                    "{}__{}".format(field.source, nested.source)
+                    for nested in field.fields.values()
+                )
+            else:
+                only.add(field.source)
+
+        # Paginators read ordering fields of objects
+        for name in queryset.query.order_by or opts.ordering:
+            name = name.lstrip("-")
+            try:
+                only.add(opts.get_field(name).name)
+            except FieldDoesNotExist:
+                pass
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        return queryset.only(*only).prefetch_related(*prefetch_related)
+
+
+def api_representation(request):
+    """
+    ETag parts of an API response: negotiated format and query
+    parameters. Expanded author avatars change without the question,
+    so such responses aren't conditional.
+    """
+    if request.query_params.get(QuestionDetailView.expand_query_param):
+        return None
+    return [
+        request.accepted_renderer.format,
+        sorted(request.query_params.lists()),
+    ]
+
+
+class IndexQuestionListView(SparseFieldsetViewMixin, generics.ListAPIView):
     """
     Index page
 
-    Return paginated set of all questions data (id and url).
+    Return paginated set of all questions data (id and url,
+    any question fields by "fields" parameter).
     Questions are sorted by date.
     """
     serializer_class = serializers.QuestionListSerializer
+    replica_reads = True
     queryset = Question.objects.all()
 
 
-class HotQuestionListView(generics.ListAPIView):
+class HotQuestionListView(SparseFieldsetViewMixin, generics.ListAPIView):
     """
     Hot questions
 
-    Return paginated set of all questions data (id and url).
-    Questions are sorted by votes count and date.
+    Return paginated set of all questions data (id and url,
+    any question fields by "fields" parameter).
+    Questions are sorted by time-decayed votes rank and date.
     """
     serializer_class = serializers.QuestionListSerializer
+    replica_reads = True
 
     def get_queryset(self):
-        questions = Question.objects.all()
+        return Question.objects.order_by("-hot_score", "-published")
 
-        questions = questions.annotate(
-            likes=Count("likers"),
-            dislikes=Count("dislikers"),
-        ).order_by(F("dislikes") - F("likes"), "-published")
 
-        return questions
-
-
-class SearchQuestionListView(generics.ListAPIView):
+class SearchQuestionListView(SparseFieldsetViewMixin, generics.ListAPIView):
     """
     Search page
 
-    Return paginated set of questions data (id and url),
-    filtered by the occurrence of a phrase in title or text.
-    Questions are sorted by votes count and date.
+    Return paginated set of questions data (id and url,
+    any question fields by "fields" parameter),
+    found by full-text search of a phrase in title and text.
+    Questions are sorted by relevance, votes count and date.
     """
     serializer_class = serializers.QuestionListSerializer
+    replica_reads = True
 
     def get_queryset(self):
         search_phrase = self.request.query_params.get("q", "")
         if search_phrase:
-            questions = Question.objects.filter(
-                Q(title__icontains=search_phrase) |
-                Q(text__icontains=search_phrase)
-            )
-        else:
-            questions = Question.objects.all()
+            return search_questions(search_phrase)
 
-        questions = questions.annotate(
-            likes=Count("likers"),
-            dislikes=Count("dislikers"),
-        ).order_by(F("dislikes") - F("likes"), "-published")
+        return Question.objects.order_by("-score", "-published")
 
-        return questions
 
-
-class QuestionDetailView(generics.RetrieveAPIView):
+class QuestionDetailView(SparseFieldsetViewMixin, generics.RetrieveAPIView):
     """
     Question detail
 
     Return info about question:
     id, title, text, publish date, author username, tags, votes count,
     answers count and link to AnswerListView page.
+    "expand" parameter (comma-separated) embeds related objects:
+    answers - first page of answers and link to the next one,
+    author - author (also of answers) as username, avatar and
+    registration date.
     """
     serializer_class = serializers.QuestionSerializer
-    queryset = Question.objects.all()
+    replica_reads = True
+    expand_query_param = "expand"
+    expandable = ("answers", "author")
+    queryset = Question.objects.select_related(
+        "author"
+    ).prefetch_related("tags")
     lookup_url_kwarg = "q_id"
 
+    @method_decorator(
+        question_condition("q_id", representation=api_representation)
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
-class AnswerListView(generics.ListAPIView):
+    def get_expand(self):
+        value = self.request.query_params.get(self.expand_query_param, "")
+        expand = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = expand - set(self.expandable)
+        if unknown:
+            raise ValidationError({
+                self.expand_query_param:
+                    "Unknown expand: {}".format(", ".join(sorted(unknown)))
+            })
+        return expand
+
+    def get_requested_fields(self):
+        # Expanded fields are returned with any requested fields
+        fields = super().get_requested_fields()
+        if fields is not None:
+            fields = fields + sorted(self.get_expand() - set(fields))
+        return fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand"] = self.get_expand()
+        return context
+
+
+class AnswerListView(SparseFieldsetViewMixin, generics.ListAPIView):
     """
     Questions answers page
 
@@ -87,8 +216,80 @@ class AnswerListView(generics.ListAPIView):
     Answer data: id, text, publish date, author username and votes count
     """
     serializer_class = serializers.AnswerSerializer
+    replica_reads = True
+    # Related manager sets answer.question by the foreign key,
+    # deferred one would be loaded for every answer
+    required_fields = ("question",)
+
+    @method_decorator(
+        question_condition("q_id", representation=api_representation)
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
         q_id = self.kwargs.get("q_id")
         question = get_object_or_404(Question, pk=q_id)
-        return question.answers.all()
+        return question.answers.select_related("author")
+
+
+class BatchVoteView(generics.GenericAPIView):
+    """
+    Batch vote
+
+    Accept list of vote operations: {"type": "q"|"a", "id": int,
+    "action": "like"|"dislike"} and apply them in one transaction
+    with the same rules as a single vote on the site.
+    Return new votes count of all voted questions and answers.
+    """
+    serializer_class = serializers.VoteSerializer
+    vote_models = {"q": Question, "a": Answer}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data
+
+        if not operations:
+            raise ValidationError("Empty votes list")
+        if len(operations) > settings.MAX_BATCH_VOTES:
+            raise ValidationError(
+                "Max votes per request: {}".format(settings.MAX_BATCH_VOTES)
+            )
+
+        votes = {vote_type: [] for vote_type in self.vote_models}
+        for operation in operations:
+            votes[operation["type"]].append(
+                (operation["id"], operation["action"] == "like")
+            )
+
+        results = []
+        with transaction.atomic():
+            for vote_type, model in self.vote_models.items():
+                if not votes[vote_type]:
+                    continue
+
+                pks = {pk for pk, _ in votes[vote_type]}
+                authors = dict(model.objects.filter(pk__in=pks).values_list(
+                    "pk", "author_id"
+                ))
+                if len(authors) != len(pks):
+                    raise ValidationError(
+                        "Bad id - obj not exist: {}".format(
+                            sorted(pks - set(authors))
+                        )
+                    )
+                if request.user.pk in authors.values():
+                    raise PermissionDenied("Can't vote own question/answer")
+
+                model.vote_many(request.user, votes[vote_type])
+
+                scores = model.objects.filter(pk__in=pks).values_list(
+                    "pk", "score"
+                )
+                results.extend(
+                    {"type": vote_type, "id": pk, "votes": score}
+                    for pk, score in scores
+                )
+
+        return Response(results)
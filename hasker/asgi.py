@@ -0,0 +1,102 @@
+"""
+ASGI config for hasker project.
+
+It exposes the ASGI callable as a module-level variable named
+``application``, to be served by uvicorn (see build.sh):
+uvicorn hasker.asgi:application
+
+Paths of ASYNC_ROUTES are served by native async handlers. Django 2.2
+has no ASGI handler, so other requests go to the WSGI application by
+asgiref WsgiToAsgi, in the pool of ASGI_THREADS threads (see
+hasker.aio): a slow database call blocks only its thread.
+"""
+import os
+import re
+import sys
+
+import django
+
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "hasker.settings.development"
+)
+django.setup(set_prefix=False)
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+
+from hasker.aio import get_executor  # noqa: E402
+from hasker.question.aio import question_events  # noqa: E402
+
+# (path regex, async handler(scope, receive, send, **groups))
+ASYNC_ROUTES = [
+    (r"^/question/(?P<pk>\d+)/events/$", question_events),
+]
+
+
+class ThreadedWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """
+    asgiref runs every WSGI call in one thread, here they run in the
+    pool concurrently. Response is sent chunk by chunk as asgiref does.
+    """
+
+    def build_environ(self, scope, body):
+        environ = super().build_environ(scope, body)
+        environ["wsgi.errors"] = sys.stderr
+        return environ
+
+    async def run_wsgi_app(self, body):
+        run = WsgiToAsgiInstance.__dict__["run_wsgi_app"].func
+        await sync_to_async(
+            run, thread_sensitive=False, executor=get_executor()
+        )(self, body)
+
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+
+    async def __call__(self, scope, receive, send):
+        await ThreadedWsgiToAsgiInstance(self.wsgi_application)(
+            scope, receive, send
+        )
+
+
+class ASGIRouter:
+    """Native async routes, other HTTP requests go to default application"""
+
+    def __init__(self, default, async_routes=()):
+        self.default = default
+        self.async_routes = [
+            (re.compile(pattern), handler)
+            for pattern, handler in async_routes
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+
+        if scope["type"] == "http":
+            for pattern, handler in self.async_routes:
+                match = pattern.match(scope["path"])
+                if match:
+                    await handler(scope, receive, send, **match.groupdict())
+                    return
+        await self.default(scope, receive, send)
+
+    @staticmethod
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = ASGIRouter(
+    ThreadedWsgiToAsgi(get_wsgi_application()), ASYNC_ROUTES
+)
+
+from hasker.question.suggest import preload_suggest_index  # noqa: E402
+preload_suggest_index()
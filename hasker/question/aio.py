@@ -0,0 +1,81 @@
+"""
+Native async handlers of question paths in ASGI mode (see ASYNC_ROUTES
+in hasker.asgi). Django 2.2 ORM is synchronous, so their queries run
+in the thread pool of hasker.aio.
+"""
+import asyncio
+
+from django.conf import settings
+
+from hasker.aio import run_in_thread
+
+from .events import format_event, subscribe_question
+from .models import Question
+
+
+async def send_text(send, status, text):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+    })
+    await send({"type": "http.response.body", "body": text.encode()})
+
+
+async def wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def question_events(scope, receive, send, pk):
+    """
+    ASGI handler streaming Server-Sent Events of the question: "score"
+    of the question and its answers and rendered new "answer"s.
+    Stream is idle between events, so it doesn't take a thread.
+    """
+    if scope["method"] != "GET":
+        await send_text(send, 405, "Method Not Allowed")
+        return
+    exists = await run_in_thread(Question.objects.filter(pk=pk).exists)
+    if not exists:
+        await send_text(send, 404, "Not Found")
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            # Don't buffer the stream in nginx
+            (b"x-accel-buffering", b"no"),
+        ],
+    })
+
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    with subscribe_question(pk) as subscription:
+        message = b"retry: 5000\n\n"
+        try:
+            while True:
+                await send({
+                    "type": "http.response.body",
+                    "body": message,
+                    "more_body": True,
+                })
+
+                event = asyncio.ensure_future(subscription.get())
+                await asyncio.wait(
+                    [event, disconnect],
+                    timeout=settings.EVENTS_KEEPALIVE,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnect.done():
+                    event.cancel()
+                    break
+                if event.done():
+                    message = format_event(event.result())
+                else:
+                    event.cancel()
+                    message = b": keepalive\n\n"
+        finally:
+            disconnect.cancel()
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class QuestionConfig(AppConfig):
     name = 'hasker.question'
+
+    def ready(self):
+        from . import receivers  # noqa: F401
@@ -0,0 +1,124 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Question
+
+TOP_QUESTIONS_KEY = "question:top_questions"
+LIST_VERSION_KEY = "question:version:list"
+QUESTION_VERSION_KEY = "question:version:{}"
+PAGE_KEY = "question:page:{version}:{path}"
+SUMMARY_KEY = "question:summary:{pk}:{updated}:{score}:{answers_count}"
+
+
+def get_top_questions_queryset():
+    return Question.objects.order_by(
+        "-hot_score", "-published"
+    )[:settings.PAGINATE_QUESTIONS]
+
+
+def get_top_questions_html():
+    """
+    Rendered "top questions" sidebar block.
+    Cached with ids of shown questions for selective invalidation.
+    """
+    cached = cache.get(TOP_QUESTIONS_KEY)
+    if cached is None:
+        questions = list(get_top_questions_queryset())
+        html = render_to_string(
+            "base/content/top_questions.html", {"top_q": questions}
+        )
+        cached = ([question.pk for question in questions], str(html))
+        cache.set(
+            TOP_QUESTIONS_KEY, cached, settings.TOP_QUESTIONS_CACHE_TIMEOUT
+        )
+
+    return mark_safe(cached[1])
+
+
+def invalidate_top_questions(pks=None):
+    """
+    Drop cached top questions block, if pks given -
+    only if any of these questions is shown in it
+    """
+    if pks is not None:
+        cached = cache.get(TOP_QUESTIONS_KEY)
+        if cached is None or not set(pks) & set(cached[0]):
+            return
+
+    cache.delete(TOP_QUESTIONS_KEY)
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Start from the current time, so a version evicted from
+        # the cache never matches keys of already cached pages
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_version(key)
+
+
+def bump_list_version():
+    bump_version(LIST_VERSION_KEY)
+
+
+def bump_question_version(pk):
+    bump_version(QUESTION_VERSION_KEY.format(pk))
+
+
+def get_list_version():
+    return get_version(LIST_VERSION_KEY)
+
+
+def get_question_version(pk):
+    return get_version(QUESTION_VERSION_KEY.format(pk))
+
+
+def get_page_key(request, version):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return PAGE_KEY.format(version=version, path=path)
+
+
+def get_question_summaries(questions):
+    """
+    Pairs (question, rendered summary block) for list pages.
+    Summaries are fetched with one get_many, key changes with
+    any of the shown question fields, so it's never invalidated.
+    """
+    keys = [
+        SUMMARY_KEY.format(
+            pk=question.pk,
+            updated=question.updated.timestamp(),
+            score=question.score,
+            answers_count=question.answers_count,
+        )
+        for question in questions
+    ]
+    summaries = cache.get_many(keys)
+
+    missed = {}
+    for key, question in zip(keys, questions):
+        if key not in summaries:
+            missed[key] = str(render_to_string(
+                "question/summary.html", {"question": question}
+            ))
+    if missed:
+        cache.set_many(missed, settings.QUESTION_SUMMARY_CACHE_TIMEOUT)
+        summaries.update(missed)
+
+    return [
+        (question, mark_safe(summaries[key]))
+        for key, question in zip(keys, questions)
+    ]
@@ -0,0 +1,147 @@
+"""
+Publish/subscribe of live question page events (new scores and
+answers), streamed to readers as Server-Sent Events in ASGI mode.
+
+Broker class is set by EVENTS_BROKER. LocalBroker delivers events
+to subscribers of the same process only, which is enough for one
+ASGI worker and for tests. A broker for several workers publishes
+events to a shared channel (e.g. Redis pub/sub) and passes messages
+received from it to LocalBroker.publish() of every worker.
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+QUESTION_CHANNEL = "question:{}"
+
+
+class Subscription:
+    """Queue of events of one channel for one stream"""
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_event_loop()
+        self.queue = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow reader misses events instead of growing the queue
+            pass
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BaseBroker:
+
+    def publish(self, channel, event):
+        """Send event (JSON-serializable dict) to subscribers of channel"""
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        """Subscription of the running event loop to channel"""
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def has_subscribers(self, channel):
+        """
+        False if nobody can receive events of channel, so they needn't
+        be prepared. Subscribers of other workers are unknown here.
+        """
+        return True
+
+
+class LocalBroker(BaseBroker):
+    """In-process broker, publish() may be called from any thread"""
+
+    def __init__(self):
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, event
+                )
+            except RuntimeError:
+                # Event loop of the subscription is closed
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self.lock:
+            self.subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def has_subscribers(self, channel):
+        with self.lock:
+            return bool(self.subscriptions.get(channel))
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.channel, None)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting == "EVENTS_BROKER":
+        _broker = None
+
+
+def publish_question_event(question_pk, event_type, data):
+    get_broker().publish(
+        QUESTION_CHANNEL.format(question_pk),
+        {"type": event_type, "data": data}
+    )
+
+
+def question_has_subscribers(question_pk):
+    return get_broker().has_subscribers(QUESTION_CHANNEL.format(question_pk))
+
+
+def subscribe_question(question_pk):
+    return get_broker().subscribe(QUESTION_CHANNEL.format(question_pk))
+
+
+def format_event(event):
+    """Server-Sent Events message"""
+    return "event: {}\ndata: {}\n\n".format(
+        event["type"], json.dumps(event["data"])
+    ).encode()
@@ -1,11 +1,6 @@
-from functools import partial
-
 from django.db import transaction
-from django.forms import (ModelForm, ModelMultipleChoiceField, SelectMultiple,
-                          ValidationError)
-from django.conf import settings
-from django.core.mail import send_mail
-from django.utils.text import Truncator
+from django.forms import Field, ModelForm, TextInput, ValidationError
+from django.urls import reverse_lazy
 
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Submit, Layout, HTML, Fieldset, ButtonHolder
@@ -29,44 +24,61 @@ class AnswerForm(ModelForm):
             Submit('add', 'Добавить', css_class='btn-primary')
         )
 
-    @transaction.atomic
-    def save(self, commit=True):
-        answer = super().save(commit)
-        transaction.on_commit(partial(self.notify_question_author, answer))
-        return answer
 
-    @staticmethod
-    def notify_question_author(answer):
-        title_truncated = Truncator(answer.question.title)
+class TagNamesField(Field):
+    """
+    Comma separated tag names, validated with a single IN query
+    instead of rendering every tag as a choice
+    """
+    default_error_messages = {
+        "unknown_tags": "Теги не найдены: %(names)s",
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("widget", TextInput(attrs={
+            "class": "tags_autocomplete",
+            "list": "tags_suggestions",
+            "autocomplete": "off",
+            "data-autocomplete-url": reverse_lazy("question:tag:search"),
+        }))
+        super().__init__(**kwargs)
 
-        subject = "Новый ответ к вопросу {} - Hasker".format(
-            title_truncated.words(5)
-        )
-        message = """
-            <p>Получен новый ответ от пользователя {answer_author}
-            к вашему вопросу <a href="{q_url}">{q_title}</a>:</p>
-            <p>{a_text}</p>
-        """.format(
-            answer_author=answer.author.username,
-            q_url=answer.question.url,
-            q_title=title_truncated.words(10),
-            a_text=Truncator(answer.text).words(25)
-        )
-        from_email = settings.TECH_EMAIL
-        recipient_list = [answer.author.email]
+    @staticmethod
+    def split_names(value):
+        names = []
+        for name in (value or "").split(","):
+            name = name.strip().lower()
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    def prepare_value(self, value):
+        if isinstance(value, str) or value is None:
+            return value
+        return ", ".join(str(tag) for tag in value)
+
+    def to_python(self, value):
+        names = self.split_names(value)
+        if not names:
+            return []
+
+        tags = {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+        unknown = [name for name in names if name not in tags]
+        if unknown:
+            raise ValidationError(
+                self.error_messages["unknown_tags"],
+                code="unknown_tags",
+                params={"names": ", ".join(unknown)}
+            )
+        return [tags[name] for name in names]
 
-        send_mail(
-            subject, message, from_email, recipient_list, fail_silently=True
-        )
+    def has_changed(self, initial, data):
+        initial_names = self.split_names(self.prepare_value(initial))
+        return initial_names != self.split_names(data)
 
 
 class QuestionForm(ModelForm):
-    tags = ModelMultipleChoiceField(
-        required=False,
-        to_field_name="name",
-        queryset=Tag.objects.all(),
-        widget=SelectMultiple(attrs={'class': 'multiselect'})
-    )
+    tags = TagNamesField(required=False, label="Теги")
 
     class Meta:
         model = Question
@@ -85,6 +97,7 @@ class QuestionForm(ModelForm):
                 'text',
                 'tags',
                 HTML("""
+                    <datalist id="tags_suggestions"></datalist>
                     <div class="input-group mb-3">
                       <input type="text" class="form-control" id="new_tag_val"
                             placeholder="Введите тег">
@@ -104,7 +117,17 @@ class QuestionForm(ModelForm):
 
     @transaction.atomic
     def save(self, commit=True):
-        return super().save(commit)
+        if not commit or self.instance._state.adding:
+            return super().save(commit)
+
+        # Edited question may be stale: its counters are updated
+        # by queries meanwhile, so only fields of the form are saved
+        self.instance.save(update_fields=[
+            name for name in self._meta.fields
+            if not self.instance._meta.get_field(name).many_to_many
+        ] + ["updated"])
+        self._save_m2m()
+        return self.instance
 
     def clean_tags(self):
         tags = self.cleaned_data["tags"]
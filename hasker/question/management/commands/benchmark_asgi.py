@@ -0,0 +1,130 @@
+import asyncio
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends import utils
+from django.test import override_settings
+
+from hasker.question.models import Question
+
+NO_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+}
+
+
+@contextmanager
+def simulated_latency(seconds):
+    """Every SQL query of any thread waits seconds, like a remote DB"""
+    execute = utils.CursorWrapper._execute
+
+    def slow_execute(self, *args, **kwargs):
+        time.sleep(seconds)
+        return execute(self, *args, **kwargs)
+
+    utils.CursorWrapper._execute = slow_execute
+    try:
+        yield
+    finally:
+        utils.CursorWrapper._execute = execute
+
+
+def get_scope(path):
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+    }
+
+
+async def asgi_get(application, path):
+    """Status of GET response of ASGI application"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(get_scope(path), receive, send)
+    return messages[0]["status"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of one WSGI worker (requests one at a time) "
+        "and ASGI mode (concurrent requests in ASGI_THREADS threads) for "
+        "question pages under simulated database latency (read only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=30,
+            help="Number of page requests",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=20,
+            help="Simulated latency of every SQL query, ms",
+        )
+
+    def handle(self, *args, **options):
+        from hasker.asgi import application
+
+        question = Question.objects.order_by("-published").first()
+        if question is None:
+            raise CommandError("No questions to request, add some first")
+
+        pages = ["/", "/hot/", question.url]
+        paths = [pages[i % len(pages)] for i in range(options["requests"])]
+        self.stdout.write(
+            "{} requests, {} ms per query, {} ASGI threads".format(
+                len(paths), options["latency"], settings.ASGI_THREADS
+            )
+        )
+
+        # Cached pages would skip the database
+        with override_settings(CACHES=NO_CACHE), \
+                simulated_latency(options["latency"] / 1000):
+            async def run_sequentially():
+                return [
+                    await asgi_get(application, path) for path in paths
+                ]
+
+            async def run_all():
+                return await asyncio.gather(*[
+                    asgi_get(application, path) for path in paths
+                ])
+
+            loop = asyncio.get_event_loop()
+            start = time.perf_counter()
+            statuses = loop.run_until_complete(run_sequentially())
+            wsgi_time = self.report("One request at a time", start, statuses)
+
+            start = time.perf_counter()
+            statuses = loop.run_until_complete(run_all())
+            asgi_time = self.report("ASGI, concurrent", start, statuses)
+            self.stdout.write("Speedup: {:.1f}x".format(
+                wsgi_time / asgi_time
+            ))
+
+    def report(self, name, start, statuses):
+        elapsed = time.perf_counter() - start
+        failed = [status for status in statuses if status != 200]
+        if failed:
+            raise CommandError("{}: responses with status {}".format(
+                name, failed[0]
+            ))
+
+        self.stdout.write("{}: {:.3f} s, {:.1f} requests/s".format(
+            name, elapsed, len(statuses) / elapsed
+        ))
+        return elapsed
@@ -0,0 +1,208 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count
+from django.test import RequestFactory
+
+from rest_framework.request import Request
+
+from hasker.api import views as api_views
+from hasker.question import views
+from hasker.question.cache import get_top_questions_queryset
+from hasker.question.models import Question, Tag
+
+# (plan line pattern, problem) by database vendor,
+# "table" group is the scanned table, sorts are checked against all
+# tables of the query
+PLAN_PROBLEMS = {
+    "sqlite": (
+        (re.compile(r"\bSCAN (TABLE )?(?P<table>\w+)$"), "sequential scan"),
+        (re.compile(r"USE TEMP B-TREE FOR ORDER BY"), "sort"),
+    ),
+    "postgresql": (
+        (re.compile(r"Seq Scan on (?P<table>\w+)"), "sequential scan"),
+        (re.compile(r"\bSort\b(?! Key| Method)"), "sort"),
+    ),
+}
+
+
+def get_view_queryset(view_class, path="/", view_kwargs=None,
+                      attrs=None, api=False, **initkwargs):
+    """Queryset of a list view for GET request to path"""
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    if api:
+        request = Request(request)
+
+    view = view_class(**initkwargs)
+    view.request = request
+    view.args = ()
+    view.kwargs = view_kwargs or {}
+    for name, value in (attrs or {}).items():
+        setattr(view, name, value)
+    return view.get_queryset()
+
+
+def get_canonical_queries():
+    """
+    (name, queryset, expected problems) of the main queries of pages
+    and API views, for the most answered question, the most popular tag
+    and the author of the question
+    """
+    questions_limit = settings.PAGINATE_QUESTIONS
+    answers_limit = settings.PAGINATE_ANSWERS
+
+    question = Question.objects.order_by("-answers_count").first()
+    tag = Tag.objects.annotate(
+        questions_count=Count("questions")
+    ).order_by("-questions_count").first()
+
+    # Matches are sorted by relevance, questions of a tag are
+    # sorted after join with tags table
+    queries = [
+        ("home", get_view_queryset(
+            views.QuestionList, sort_by_date=True
+        )[:questions_limit], ()),
+        ("hot", get_view_queryset(
+            views.QuestionList, sort_by_hot=True
+        )[:questions_limit], ()),
+        ("search", get_view_queryset(
+            views.QuestionList, attrs={"search_phrase": "question"}
+        )[:questions_limit], ("sort",)),
+        ("top_questions", get_top_questions_queryset(), ()),
+        ("api_index", get_view_queryset(
+            api_views.IndexQuestionListView, api=True
+        )[:questions_limit], ()),
+        ("api_hot", get_view_queryset(
+            api_views.HotQuestionListView, api=True
+        )[:questions_limit], ()),
+        ("api_search", get_view_queryset(
+            api_views.SearchQuestionListView, path="/?q=question", api=True
+        )[:questions_limit], ("sort",)),
+    ]
+
+    if tag is not None:
+        queries.append(("tag", get_view_queryset(
+            views.QuestionList, attrs={"tag_name": tag.name}
+        )[:questions_limit], ("sort",)))
+
+    if question is not None:
+        detail_view = views.QuestionDetailView()
+        detail_view.object = question
+        queries += [
+            ("detail", views.QuestionDetailView.queryset.filter(
+                pk=question.pk
+            ), ()),
+            ("answers", detail_view.get_answers_queryset()[:answers_limit],
+             ()),
+            ("api_answers", get_view_queryset(
+                api_views.AnswerListView, api=True,
+                view_kwargs={"q_id": question.pk}
+            )[:questions_limit], ()),
+            ("profile_questions", question.author.question_set.all()[:10],
+             ()),
+            ("profile_answers", question.author.answer_set.select_related(
+                "question"
+            )[:10], ()),
+        ]
+
+    return queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the main queries of pages and API views and "
+        "report sequential scans and sorts on large tables"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=10000,
+            help="Tables with fewer rows are not reported",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to check plans on",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        self.connection = connections[options["database"]]
+        self.min_rows = options["min_rows"]
+        self.table_rows = {}
+
+        problems_count = 0
+        for name, queryset, expected in get_canonical_queries():
+            queryset = queryset.using(options["database"])
+            problems = self.check_plan(name, queryset, expected)
+            problems_count += len(problems)
+
+        if problems_count:
+            raise CommandError(
+                "Found {} query plan problems".format(problems_count)
+            )
+
+    def check_plan(self, name, queryset, expected=()):
+        """Report problems of the plan, return not expected ones"""
+        plan = queryset.explain()
+        # Joins are set up on compilation
+        query = queryset.query.clone()
+        query.get_compiler(queryset.db).as_sql()
+        tables = {join.table_name for join in query.alias_map.values()}
+
+        problems = []
+        expected_problems = []
+        for line in plan.splitlines():
+            for pattern, problem in PLAN_PROBLEMS.get(
+                self.connection.vendor, ()
+            ):
+                match = pattern.search(line)
+                if not match:
+                    continue
+                problem_tables = (
+                    [match.group("table")]
+                    if "table" in pattern.groupindex else sorted(tables)
+                )
+                large_tables = [
+                    table for table in problem_tables
+                    if self.get_table_rows(table) >= self.min_rows
+                ]
+                if large_tables:
+                    description = "{} on {}".format(
+                        problem, ", ".join(large_tables)
+                    )
+                    if problem in expected:
+                        expected_problems.append(description + " (expected)")
+                    else:
+                        problems.append(description)
+
+        report = problems + expected_problems
+        self.stdout.write("{}: {}".format(
+            name, "; ".join(report) if report else "OK"
+        ))
+        if self.verbosity > 1:
+            self.stdout.write(plan)
+        return problems
+
+    def get_table_rows(self, table):
+        """Planner estimate on PostgreSQL, exact count on other databases"""
+        if table not in self.table_rows:
+            with self.connection.cursor() as cursor:
+                if self.connection.vendor == "postgresql":
+                    cursor.execute(
+                        "SELECT reltuples FROM pg_class WHERE relname = %s",
+                        [table]
+                    )
+                else:
+                    cursor.execute("SELECT COUNT(*) FROM {}".format(
+                        self.connection.ops.quote_name(table)
+                    ))
+                row = cursor.fetchone()
+            self.table_rows[table] = int(row[0]) if row else 0
+        return self.table_rows[table]
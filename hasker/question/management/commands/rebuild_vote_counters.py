@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q
+
+from hasker.question.models import Question, Answer, AbstractVote
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild denormalized likes/dislikes/score counters of questions "
+        "and answers from the votes tables"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify counters, exit with error on mismatch",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        mismatches = 0
+        for model in (Question, Answer):
+            mismatches += self.process_model(model, options["check"])
+
+        if options["check"] and mismatches:
+            raise CommandError(
+                "Found {} objects with wrong vote counters".format(mismatches)
+            )
+
+    @transaction.atomic
+    def process_model(self, model, check_only):
+        objects = model.objects.annotate(
+            real_likes=Count(
+                "vote_set", filter=Q(vote_set__value=AbstractVote.LIKE)
+            ),
+            real_dislikes=Count(
+                "vote_set", filter=Q(vote_set__value=AbstractVote.DISLIKE)
+            ),
+        ).only("pk", "likes", "dislikes", "score").order_by()
+
+        to_update = []
+        for obj in objects.iterator():
+            real_score = obj.real_likes - obj.real_dislikes
+            counters = (obj.likes, obj.dislikes, obj.score)
+            if counters == (obj.real_likes, obj.real_dislikes, real_score):
+                continue
+
+            if self.verbosity > 1:
+                self.stdout.write("{} #{}: {} -> {}".format(
+                    model.__name__, obj.pk, counters,
+                    (obj.real_likes, obj.real_dislikes, real_score)
+                ))
+            obj.likes = obj.real_likes
+            obj.dislikes = obj.real_dislikes
+            obj.score = real_score
+            to_update.append(obj)
+
+        if not check_only:
+            model.objects.bulk_update(
+                to_update, ["likes", "dislikes", "score"], batch_size=500
+            )
+
+        self.stdout.write("{}: {} {}".format(
+            model.__name__,
+            len(to_update),
+            "mismatched" if check_only else "fixed"
+        ))
+        return len(to_update)
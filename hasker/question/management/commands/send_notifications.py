@@ -0,0 +1,77 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from hasker.question.notifications import (
+    prune_sent_notifications, send_notifications_batch
+)
+
+# Seconds between deletions of old sent notifications with --loop
+PRUNE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued answer notification emails in batches, "
+        "one mail connection per batch, failed ones are retried with backoff"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help=(
+                "Notifications claimed at once, "
+                "their emails share a connection"
+            ),
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=settings.NOTIFICATION_MAX_ATTEMPTS,
+            help="Notification isn't sent after this number of failures",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll the queue",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait for new notifications with --loop",
+        )
+
+    def handle(self, *args, **options):
+        last_pruned = None
+        while True:
+            total_sent = total_failed = 0
+            while True:
+                claimed, sent, failed = send_notifications_batch(
+                    options["batch_size"], options["max_attempts"]
+                )
+                total_sent += sent
+                total_failed += failed
+                # Digests merge notifications, so count the claimed ones
+                if claimed < options["batch_size"]:
+                    break
+
+            if total_sent or total_failed or options["verbosity"] > 1:
+                self.stdout.write("Sent {} notifications, {} failed".format(
+                    total_sent, total_failed
+                ))
+            now = time.monotonic()
+            if last_pruned is None or now - last_pruned > PRUNE_INTERVAL:
+                pruned = prune_sent_notifications()
+                last_pruned = now
+                if pruned or options["verbosity"] > 1:
+                    self.stdout.write(
+                        "Deleted {} old sent notifications".format(pruned)
+                    )
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
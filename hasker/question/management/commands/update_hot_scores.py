@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from hasker.question.cache import (invalidate_top_questions,
+                                   bump_list_version)
+from hasker.question.models import Question
+from hasker.question.ranking import hot_score
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute time-decayed hot_score of questions, "
+        "should be run periodically (e.g. every 5 minutes by cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Questions updated per query",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        batch_size = options["batch_size"]
+
+        questions = Question.objects.only(
+            "pk", "score", "published", "hot_score"
+        ).order_by()
+
+        batch = []
+        updated = 0
+        for question in questions.iterator(chunk_size=batch_size):
+            question.hot_score = hot_score(
+                question.score, question.published, now
+            )
+            batch.append(question)
+            if len(batch) >= batch_size:
+                Question.objects.bulk_update(batch, ["hot_score"])
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            Question.objects.bulk_update(batch, ["hot_score"])
+            updated += len(batch)
+
+        invalidate_top_questions()
+        bump_list_version()
+        self.stdout.write("Updated hot score of {} questions".format(updated))
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Answer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('published', models.DateTimeField(auto_now_add=True, verbose_name='Дата публикации')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+                ('text', models.TextField(max_length=5000, verbose_name='Ваш ответ')),
+            ],
+            options={
+                'ordering': ['-published'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Question',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(max_length=5000, verbose_name='Содержимое')),
+                ('published', models.DateTimeField(auto_now_add=True, verbose_name='Дата публикации')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+                ('title', models.CharField(max_length=200, verbose_name='Заголовок')),
+            ],
+            options={
+                'ordering': ['-published'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Тег')),
+            ],
+        ),
+    ]
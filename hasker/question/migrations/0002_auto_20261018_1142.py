@@ -0,0 +1,63 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('question', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='correct_answer',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='question1', to='question.Answer'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='dislikers',
+            field=models.ManyToManyField(related_name='q_dislikes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='likers',
+            field=models.ManyToManyField(related_name='q_likes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='questions', to='question.Tag'),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='dislikers',
+            field=models.ManyToManyField(related_name='a_dislikes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='likers',
+            field=models.ManyToManyField(related_name='a_likes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='question',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='question.Question'),
+        ),
+    ]
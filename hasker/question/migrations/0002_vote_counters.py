@@ -0,0 +1,66 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_vote_counters(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    for model_name in ("Question", "Answer"):
+        model = apps.get_model("question", model_name)
+        objects = model.objects.using(db_alias).annotate(
+            likers_count=Count("likers", distinct=True),
+            dislikers_count=Count("dislikers", distinct=True),
+        ).filter(models.Q(likers_count__gt=0) | models.Q(dislikers_count__gt=0))
+
+        to_update = []
+        for obj in objects.iterator():
+            obj.likes = obj.likers_count
+            obj.dislikes = obj.dislikers_count
+            obj.score = obj.likers_count - obj.dislikers_count
+            to_update.append(obj)
+        model.objects.using(db_alias).bulk_update(
+            to_update, ["likes", "dislikes", "score"], batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0002_auto_20261018_1142'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='likes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Лайки'),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='dislikes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Дизлайки'),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='score',
+            field=models.IntegerField(default=0, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='likes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Лайки'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='dislikes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Дизлайки'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='score',
+            field=models.IntegerField(default=0, verbose_name='Рейтинг'),
+        ),
+        migrations.RunPython(
+            fill_vote_counters, migrations.RunPython.noop,
+            hints={"data_migration": True}
+        ),
+    ]
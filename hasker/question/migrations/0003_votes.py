@@ -0,0 +1,40 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('question', '0002_vote_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionVote',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(choices=[(1, 'Нравится'), (-1, 'Не нравится')], verbose_name='Голос')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_set', to='question.Question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_votes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'question')},
+            },
+        ),
+        migrations.CreateModel(
+            name='AnswerVote',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(choices=[(1, 'Нравится'), (-1, 'Не нравится')], verbose_name='Голос')),
+                ('answer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_set', to='question.Answer')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_votes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'answer')},
+            },
+        ),
+    ]
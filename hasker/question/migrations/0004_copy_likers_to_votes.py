@@ -0,0 +1,81 @@
+from django.db import migrations
+from django.db.models import Count, Q
+
+LIKE = 1
+DISLIKE = -1
+
+# (voted model, vote model, name of the FK to the voted object)
+VOTE_TARGETS = (
+    ("Question", "QuestionVote", "question"),
+    ("Answer", "AnswerVote", "answer"),
+)
+
+
+def copy_likers_to_votes(apps, schema_editor):
+    for model_name, vote_model_name, target in VOTE_TARGETS:
+        model = apps.get_model("question", model_name)
+        vote_model = apps.get_model("question", vote_model_name)
+
+        target_id = "{}_id".format(target)
+        for relation, value in (("likers", LIKE), ("dislikers", DISLIKE)):
+            through = getattr(model, relation).through
+            votes = (
+                vote_model(user_id=user_id, value=value, **{target_id: obj_id})
+                for obj_id, user_id in through.objects.values_list(
+                    target_id, "user_id"
+                ).iterator()
+            )
+            # Likes are copied first, so they win over (impossible
+            # in vote()) duplicated dislikes of the same user
+            vote_model.objects.bulk_create(
+                votes, batch_size=1000, ignore_conflicts=True
+            )
+
+        objects = model.objects.annotate(
+            real_likes=Count("vote_set", filter=Q(vote_set__value=LIKE)),
+            real_dislikes=Count("vote_set", filter=Q(vote_set__value=DISLIKE)),
+        )
+        to_update = []
+        for obj in objects.iterator():
+            if (obj.likes, obj.dislikes) == (obj.real_likes, obj.real_dislikes):
+                continue
+            obj.likes = obj.real_likes
+            obj.dislikes = obj.real_dislikes
+            obj.score = obj.real_likes - obj.real_dislikes
+            to_update.append(obj)
+        model.objects.bulk_update(
+            to_update, ["likes", "dislikes", "score"], batch_size=500
+        )
+
+
+def copy_votes_to_likers(apps, schema_editor):
+    for model_name, vote_model_name, target in VOTE_TARGETS:
+        model = apps.get_model("question", model_name)
+        vote_model = apps.get_model("question", vote_model_name)
+
+        target_id = "{}_id".format(target)
+        for relation, value in (("likers", LIKE), ("dislikers", DISLIKE)):
+            through = getattr(model, relation).through
+            rows = (
+                through(user_id=user_id, **{target_id: obj_id})
+                for obj_id, user_id in vote_model.objects.filter(
+                    value=value
+                ).values_list(target_id, "user_id").iterator()
+            )
+            through.objects.bulk_create(
+                rows, batch_size=1000, ignore_conflicts=True
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0003_votes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            copy_likers_to_votes, copy_votes_to_likers,
+            hints={"data_migration": True}
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0004_copy_likers_to_votes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='answer',
+            name='dislikers',
+        ),
+        migrations.RemoveField(
+            model_name='answer',
+            name='likers',
+        ),
+        migrations.RemoveField(
+            model_name='question',
+            name='dislikers',
+        ),
+        migrations.RemoveField(
+            model_name='question',
+            name='likers',
+        ),
+    ]
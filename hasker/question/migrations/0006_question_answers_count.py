@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_answers_count(apps, schema_editor):
+    Question = apps.get_model("question", "Question")
+    Answer = apps.get_model("question", "Answer")
+
+    answers = Answer.objects.filter(question=OuterRef("pk")).order_by().values(
+        "question"
+    ).annotate(count=Count("pk")).values("count")
+    Question.objects.update(answers_count=Coalesce(Subquery(answers), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0005_remove_likers_dislikers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='answers_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Кол-во ответов'),
+        ),
+        migrations.RunPython(
+            fill_answers_count, migrations.RunPython.noop,
+            hints={"data_migration": True}
+        ),
+    ]
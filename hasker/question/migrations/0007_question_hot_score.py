@@ -0,0 +1,39 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:44
+
+from django.db import migrations, models
+from django.utils import timezone
+
+from hasker.question.ranking import hot_score
+
+
+def fill_hot_score(apps, schema_editor):
+    Question = apps.get_model("question", "Question")
+
+    now = timezone.now()
+    questions = list(Question.objects.only("pk", "score", "published"))
+    for question in questions:
+        question.hot_score = hot_score(question.score, question.published, now)
+    Question.objects.bulk_update(questions, ["hot_score"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0006_question_answers_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='hot_score',
+            field=models.FloatField(default=0, verbose_name='Рейтинг для горячих'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-hot_score', '-published'], name='question_hot_idx'),
+        ),
+        migrations.RunPython(
+            fill_hot_score, migrations.RunPython.noop,
+            hints={"data_migration": True}
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0007_question_hot_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='last_activity',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Последняя активность'),
+        ),
+    ]
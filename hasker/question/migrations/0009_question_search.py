@@ -0,0 +1,105 @@
+from django.db import migrations
+
+# Must match PostgreSQLSearchBackend.config
+POSTGRES_CONFIG = "russian"
+
+# Note: SQLite drops triggers, when a migration rebuilds question table,
+# they have to be created again by such migration
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE question_search USING fts5(
+        title, text, tokenize = 'unicode61'
+    )
+    """,
+    """
+    INSERT INTO question_search (rowid, title, text)
+    SELECT id, title, text FROM question_question
+    """,
+    """
+    CREATE TRIGGER question_search_insert
+    AFTER INSERT ON question_question BEGIN
+        INSERT INTO question_search (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER question_search_update
+    AFTER UPDATE OF title, text ON question_question BEGIN
+        UPDATE question_search SET title = new.title, text = new.text
+        WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER question_search_delete
+    AFTER DELETE ON question_question BEGIN
+        DELETE FROM question_search WHERE rowid = old.id;
+    END
+    """,
+)
+
+SQLITE_BACKWARD = (
+    "DROP TRIGGER IF EXISTS question_search_insert",
+    "DROP TRIGGER IF EXISTS question_search_update",
+    "DROP TRIGGER IF EXISTS question_search_delete",
+    "DROP TABLE IF EXISTS question_search",
+)
+
+POSTGRES_FORWARD = (
+    "ALTER TABLE question_question ADD COLUMN search_document tsvector",
+    """
+    CREATE FUNCTION question_search_document() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_document :=
+            setweight(to_tsvector('{config}', coalesce(NEW.title, '')), 'A')
+            || setweight(to_tsvector('{config}', coalesce(NEW.text, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """.format(config=POSTGRES_CONFIG),
+    """
+    CREATE TRIGGER question_search_document
+    BEFORE INSERT OR UPDATE OF title, text ON question_question
+    FOR EACH ROW EXECUTE PROCEDURE question_search_document()
+    """,
+    # Fill existing rows by the trigger
+    "UPDATE question_question SET title = title",
+    """
+    CREATE INDEX question_search_document_idx
+    ON question_question USING gin (search_document)
+    """,
+)
+
+POSTGRES_BACKWARD = (
+    "DROP INDEX IF EXISTS question_search_document_idx",
+    "DROP TRIGGER IF EXISTS question_search_document ON question_question",
+    "DROP FUNCTION IF EXISTS question_search_document()",
+    "ALTER TABLE question_question DROP COLUMN IF EXISTS search_document",
+)
+
+
+def run_vendor_sql(statements):
+    def run(apps, schema_editor):
+        statements_by_vendor = statements.get(schema_editor.connection.vendor)
+        for sql in statements_by_vendor or ():
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0008_question_last_activity'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql({
+                "sqlite": SQLITE_FORWARD,
+                "postgresql": POSTGRES_FORWARD,
+            }),
+            run_vendor_sql({
+                "sqlite": SQLITE_BACKWARD,
+                "postgresql": POSTGRES_BACKWARD,
+            }),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('question', '0010_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Отправить после')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток отправки')),
+                ('sent', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('answer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='question.Answer')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='answernotification',
+            index=models.Index(condition=models.Q(sent__isnull=True), fields=['send_after'], name='notification_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0011_answer_notification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answernotification',
+            index=models.Index(fields=['recipient', 'sent'], name='notification_sent_idx'),
+        ),
+    ]
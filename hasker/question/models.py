@@ -1,7 +1,13 @@
-from django.db import models, transaction
+from django.db import models, transaction, connection
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 
 from django.conf import settings
+from django.utils import timezone
+
+from . import ranking
+from .signals import votes_changed
 
 
 # Create your models here.
@@ -13,8 +19,10 @@ class AbstractQA(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
-    likers = models.ManyToManyField(settings.AUTH_USER_MODEL)
-    dislikers = models.ManyToManyField(settings.AUTH_USER_MODEL)
+    # Denormalized vote_set counters, maintained by vote()
+    likes = models.PositiveIntegerField("Лайки", default=0)
+    dislikes = models.PositiveIntegerField("Дизлайки", default=0)
+    score = models.IntegerField("Рейтинг", default=0)
 
     class Meta:
         abstract = True
@@ -22,22 +30,115 @@ class AbstractQA(models.Model):
 
     @property
     def votes(self):
-        return self.likers.count() - self.dislikers.count()
+        return self.score
 
     @transaction.atomic
     def vote(self, user, like=True):
-        if like:
-            self.dislikers.remove(user)
-            if self.likers.filter(pk=user.pk).exists():
-                self.likers.remove(user)
-            else:
-                self.likers.add(user)
-        else:
-            self.likers.remove(user)
-            if self.dislikers.filter(pk=user.pk).exists():
-                self.dislikers.remove(user)
-            else:
-                self.dislikers.add(user)
+        # Lock the row so concurrent votes of the same object are serialized
+        objects = type(self).objects.filter(pk=self.pk)
+        objects.select_for_update().values_list("pk", flat=True).get()
+
+        value = AbstractVote.LIKE if like else AbstractVote.DISLIKE
+        # Repeated vote cancels the previous one,
+        # the opposite vote replaces it
+        deleted, _ = self.vote_set.filter(user=user, value=value).delete()
+        if not deleted:
+            self._upsert_vote(user, value)
+
+        self.update_vote_counters([self.pk])
+        self.refresh_from_db(fields=("likes", "dislikes", "score"))
+        self._send_votes_changed([self.pk])
+
+    @classmethod
+    @transaction.atomic
+    def vote_many(cls, user, votes):
+        """
+        Apply list of (pk, like) votes of the user with the same toggle
+        rules as vote(), using bulk reads and writes for all objects
+        """
+        pks = {pk for pk, _ in votes}
+        list(cls.objects.select_for_update().filter(pk__in=pks).values_list(
+            "pk", flat=True
+        ))
+
+        target = cls.vote_set.field
+        vote_model = target.model
+        user_votes = vote_model.objects.filter(
+            user=user, **{"{}__in".format(target.name): pks}
+        )
+        current = dict(user_votes.values_list(target.attname, "value"))
+
+        state = dict(current)
+        for pk, like in votes:
+            value = AbstractVote.LIKE if like else AbstractVote.DISLIKE
+            state[pk] = None if state.get(pk) == value else value
+
+        to_delete = [pk for pk, value in state.items() if value is None]
+        if to_delete:
+            user_votes.filter(
+                **{"{}__in".format(target.attname): to_delete}
+            ).delete()
+
+        vote_model.objects.bulk_create(
+            vote_model(user=user, value=value, **{target.attname: pk})
+            for pk, value in state.items()
+            if value is not None and pk not in current
+        )
+
+        for value in (AbstractVote.LIKE, AbstractVote.DISLIKE):
+            flipped = [
+                pk for pk, new_value in state.items()
+                if new_value == value and current.get(pk, value) != value
+            ]
+            if flipped:
+                user_votes.filter(
+                    **{"{}__in".format(target.attname): flipped}
+                ).update(value=value)
+
+        cls.update_vote_counters(pks)
+        cls._send_votes_changed(pks)
+
+    @classmethod
+    def update_vote_counters(cls, pks, **updates):
+        """Recount votes of objects, updates are extra fields to set"""
+        likes = cls._count_votes(AbstractVote.LIKE)
+        dislikes = cls._count_votes(AbstractVote.DISLIKE)
+        cls.objects.filter(pk__in=pks).update(
+            likes=likes, dislikes=dislikes, score=likes - dislikes, **updates
+        )
+
+    @classmethod
+    def _send_votes_changed(cls, pks):
+        transaction.on_commit(
+            lambda: votes_changed.send(sender=cls, pks=list(pks))
+        )
+
+    def _upsert_vote(self, user, value):
+        vote_model = self.vote_set.model
+        qn = connection.ops.quote_name
+        sql = (
+            "INSERT INTO {table} ({user}, {target}, {value}) "
+            "VALUES (%s, %s, %s) "
+            "ON CONFLICT ({user}, {target}) "
+            "DO UPDATE SET {value} = EXCLUDED.{value}"
+        ).format(
+            table=qn(vote_model._meta.db_table),
+            user=qn(vote_model._meta.get_field("user").column),
+            target=qn(self.vote_set.field.column),
+            value=qn(vote_model._meta.get_field("value").column),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user.pk, self.pk, value])
+
+    @classmethod
+    def _count_votes(cls, value):
+        target = cls.vote_set.field
+        votes = target.model.objects.filter(
+            value=value, **{target.name: OuterRef("pk")}
+        ).order_by().values(target.name).annotate(
+            count=Count("pk")
+        ).values("count")
+        return Coalesce(Subquery(votes), 0)
 
 
 class Tag(models.Model):
@@ -58,22 +159,55 @@ class Question(AbstractQA):
     title = models.CharField("Заголовок", max_length=200)
 
     tags = models.ManyToManyField(Tag, blank=True, related_name="questions")
-    likers = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="q_likes"
-    )
-    dislikers = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="q_dislikes"
-    )
+    # Denormalized answers counter, maintained by signals
+    answers_count = models.PositiveIntegerField("Кол-во ответов", default=0)
     correct_answer = models.OneToOneField(
         "Answer",
         blank=True, null=True,
         on_delete=models.CASCADE,
         related_name="question1"
     )
+    # Time-decayed rank for "hot" feeds, see update_hot_scores command
+    hot_score = models.FloatField("Рейтинг для горячих", default=0)
+    # Time of the last answer or vote change, updated by receivers
+    # and update_vote_counters()
+    last_activity = models.DateTimeField(
+        "Последняя активность", default=timezone.now
+    )
+
+    class Meta(AbstractQA.Meta):
+        indexes = [
+            models.Index(
+                fields=["-hot_score", "-published"], name="question_hot_idx"
+            ),
+            models.Index(fields=["-published"], name="question_published_idx"),
+            models.Index(
+                fields=["-score", "-published"], name="question_score_idx"
+            ),
+            models.Index(
+                fields=["author", "-published"], name="question_author_idx"
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.hot_score = ranking.hot_score(self.score, timezone.now())
+        super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse('question:detail', kwargs={'id': self.pk})
 
+    @classmethod
+    def update_vote_counters(cls, pks, **updates):
+        # Same UPDATE moves page Last-Modified in the vote transaction
+        super().update_vote_counters(
+            pks, last_activity=timezone.now(), **updates
+        )
+
+    @property
+    def last_modified(self):
+        return max(self.updated, self.last_activity)
+
     @property
     def url(self):
         return self.get_absolute_url()
@@ -85,9 +219,102 @@ class Answer(AbstractQA):
     question = models.ForeignKey(
         Question, related_name="answers", on_delete=models.CASCADE
     )
-    likers = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="a_likes"
+
+    class Meta(AbstractQA.Meta):
+        indexes = [
+            # Answers of a question page
+            models.Index(
+                fields=["question", "-score", "-published"],
+                name="answer_question_idx"
+            ),
+            # Answers of a question in API
+            models.Index(
+                fields=["question", "-published"],
+                name="answer_question_published_idx"
+            ),
+            models.Index(
+                fields=["author", "-published"], name="answer_author_idx"
+            ),
+        ]
+
+    @classmethod
+    def update_vote_counters(cls, pks, **updates):
+        super().update_vote_counters(pks, **updates)
+        # Question page shows answer scores
+        Question.objects.filter(answers__pk__in=pks).update(
+            last_activity=timezone.now()
+        )
+
+
+class AbstractVote(models.Model):
+    LIKE = 1
+    DISLIKE = -1
+    VALUE_CHOICES = (
+        (LIKE, "Нравится"),
+        (DISLIKE, "Не нравится"),
+    )
+
+    value = models.SmallIntegerField("Голос", choices=VALUE_CHOICES)
+
+    class Meta:
+        abstract = True
+
+
+class QuestionVote(AbstractVote):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="question_votes"
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="vote_set"
+    )
+
+    class Meta:
+        unique_together = ("user", "question")
+
+
+class AnswerVote(AbstractVote):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="answer_votes"
+    )
+    answer = models.ForeignKey(
+        Answer, on_delete=models.CASCADE, related_name="vote_set"
     )
-    dislikers = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="a_dislikes"
+
+    class Meta:
+        unique_together = ("user", "answer")
+
+
+class AnswerNotification(models.Model):
+    """
+    Outbox of emails about new answers, filled in the transaction of the
+    answer and sent by send_notifications command
+    """
+    answer = models.ForeignKey(
+        Answer, on_delete=models.CASCADE, related_name="notifications"
+    )
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="answer_notifications"
     )
+    created = models.DateTimeField("Создано", auto_now_add=True)
+    send_after = models.DateTimeField("Отправить после", default=timezone.now)
+    attempts = models.PositiveSmallIntegerField("Попыток отправки", default=0)
+    sent = models.DateTimeField("Отправлено", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["send_after"], name="notification_pending_idx",
+                condition=models.Q(sent__isnull=True)
+            ),
+            # Last sent digest of the recipient
+            models.Index(
+                fields=["recipient", "sent"], name="notification_sent_idx"
+            ),
+        ]
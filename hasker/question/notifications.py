@@ -0,0 +1,171 @@
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .models import AnswerNotification
+
+
+def build_digest_email(recipient, question, answers):
+    """One email about all new answers to the question"""
+    title_truncated = Truncator(question.title)
+
+    if len(answers) == 1:
+        subject = "Новый ответ к вопросу {} - Hasker"
+    else:
+        subject = "Новые ответы ({}) к вопросу {{}} - Hasker".format(
+            len(answers)
+        )
+    subject = subject.format(title_truncated.words(5))
+
+    # Autoescaped: titles, names and answers are user input
+    message = render_to_string("question/email/answers.html", {
+        "question": question,
+        "question_url": urljoin(settings.SITE_URL, question.url),
+        "answers": answers,
+    })
+
+    email = EmailMessage(
+        subject, message, settings.TECH_EMAIL, [recipient.email]
+    )
+    email.content_subtype = "html"
+    return email
+
+
+def group_digests(notifications):
+    """{(recipient id, question id): [notifications]} in answers order"""
+    digests = {}
+    for notification in sorted(
+        notifications, key=lambda notification: notification.answer_id
+    ):
+        key = (notification.recipient_id, notification.answer.question_id)
+        digests.setdefault(key, []).append(notification)
+    return digests
+
+
+def get_last_sent(digests, since):
+    """
+    Last send time of notifications sent after since for
+    (recipient, question) pairs of digests, in one query
+    """
+    recipients = {recipient for recipient, question in digests}
+    questions = {question for recipient, question in digests}
+    rows = AnswerNotification.objects.filter(
+        sent__gt=since,
+        recipient_id__in=recipients,
+        answer__question_id__in=questions
+    ).values_list("recipient_id", "answer__question_id").annotate(
+        last_sent=Max("sent")
+    ).order_by()
+    return {
+        (recipient, question): last_sent
+        for recipient, question, last_sent in rows
+    }
+
+
+def prune_sent_notifications():
+    """Delete notifications sent NOTIFICATION_KEEP_SENT ago, return count"""
+    keep = max(
+        settings.NOTIFICATION_KEEP_SENT, settings.NOTIFICATION_DIGEST_WINDOW
+    )
+    deleted, _ = AnswerNotification.objects.filter(
+        sent__lt=timezone.now() - timedelta(seconds=keep)
+    ).delete()
+    return deleted
+
+
+def retry_delay(attempts):
+    """Exponential backoff: NOTIFICATION_RETRY_DELAY * 2 ** (attempts - 1)"""
+    return timedelta(
+        seconds=settings.NOTIFICATION_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+@transaction.atomic
+def claim_notifications(batch_size, max_attempts):
+    """
+    Pending notifications of a batch, their send_after is moved
+    by NOTIFICATION_CLAIM_TIMEOUT, so parallel workers skip them
+    """
+    now = timezone.now()
+    notifications = list(
+        AnswerNotification.objects.select_for_update(
+            skip_locked=True, of=("self",)
+        ).filter(
+            sent__isnull=True, send_after__lte=now, attempts__lt=max_attempts
+        ).select_related(
+            "recipient", "answer__author", "answer__question"
+        ).order_by("send_after")[:batch_size]
+    )
+    AnswerNotification.objects.filter(
+        pk__in=[notification.pk for notification in notifications]
+    ).update(send_after=now + timedelta(
+        seconds=settings.NOTIFICATION_CLAIM_TIMEOUT
+    ))
+    return notifications
+
+
+def send_notifications_batch(batch_size, max_attempts):
+    """
+    Send a batch of pending notifications as digests: one email per
+    recipient and question with all its new answers, at most one in
+    NOTIFICATION_DIGEST_WINDOW seconds (later ones wait for the window
+    end). Emails share one mail connection, failed ones are retried
+    with backoff. Return (claimed, sent, failed) counts: notifications
+    taken from the queue and emails sent or failed.
+    """
+    notifications = claim_notifications(batch_size, max_attempts)
+    if not notifications:
+        return 0, 0, 0
+
+    now = timezone.now()
+    window = timedelta(seconds=settings.NOTIFICATION_DIGEST_WINDOW)
+    digests = group_digests(notifications)
+    last_sent = get_last_sent(digests, now - window) if window else {}
+
+    deferred, sent, failed = [], [], []
+    for key in list(digests):
+        if key in last_sent:
+            for notification in digests.pop(key):
+                notification.send_after = last_sent[key] + window
+                deferred.append(notification)
+
+    try:
+        with get_connection() as connection:
+            for digest in digests.values():
+                first = digest[0]
+                try:
+                    connection.send_messages([build_digest_email(
+                        first.recipient, first.answer.question,
+                        [notification.answer for notification in digest]
+                    )])
+                except Exception as e:
+                    failed.append((digest, e))
+                else:
+                    sent.append(digest)
+    except Exception as e:
+        # Connection can't be opened or closed
+        failed = [(digest, e) for digest in digests.values()
+                  if digest not in sent]
+
+    now = timezone.now()
+    AnswerNotification.objects.filter(pk__in=[
+        notification.pk for digest in sent for notification in digest
+    ]).update(sent=now)
+
+    for digest, error in failed:
+        for notification in digest:
+            notification.attempts += 1
+            notification.send_after = now + retry_delay(notification.attempts)
+            notification.last_error = repr(error)
+            deferred.append(notification)
+    AnswerNotification.objects.bulk_update(
+        deferred, ["attempts", "send_after", "last_error"]
+    )
+    return len(notifications), len(sent), len(failed)
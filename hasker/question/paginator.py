@@ -0,0 +1,202 @@
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator, InvalidPage
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from .cache import get_list_version
+
+COUNT_KEY = "question:count:{version}:{query}"
+
+
+def estimate_count(queryset, sql, params):
+    """
+    Planner rows estimate of the query on PostgreSQL,
+    None if it's below PAGINATION_COUNT_ESTIMATE_THRESHOLD
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+
+    rows = int(plan[0]["Plan"]["Plan Rows"])
+    if rows < settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+        return None
+    return rows
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator, which caches total count of a queryset for
+    PAGINATION_COUNT_CACHE_TIMEOUT seconds (key depends on the query and
+    questions list version) and uses planner estimate for big results.
+    count - already known total count, e.g. question.answers_count.
+    """
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.__dict__["count"] = count
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+
+        queryset = self.object_list.order_by()
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+
+        query = hashlib.md5(repr((sql, params)).encode()).hexdigest()
+        key = COUNT_KEY.format(version=get_list_version(), query=query)
+        count = cache.get(key)
+        if count is None:
+            count = estimate_count(queryset, sql, params)
+            if count is None:
+                count = queryset.count()
+            cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+
+        return count
+
+
+def is_cursor_mode(params):
+    """Keyset pagination is used if set globally or cursor param is given"""
+    return settings.PAGINATION_MODE == "cursor" or "cursor" in params
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset) pagination: pages are selected by
+    WHERE (ordering fields) < (values of the last shown object)
+    instead of OFFSET, so cost of a page doesn't depend on its depth
+    and total count is never needed. Ordering is taken from queryset
+    and made unique with id. Cursors are signed opaque strings.
+    """
+    cursor_salt = "hasker.question.paginator.cursor"
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = self.get_ordering(queryset)
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = list(
+            queryset.query.order_by or queryset.model._meta.ordering
+        )
+        if any(not isinstance(field, str) for field in ordering):
+            raise ValueError("Keyset pagination needs field names ordering")
+
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            descending = bool(ordering) and ordering[-1].startswith("-")
+            ordering.append("-id" if descending else "id")
+        return ordering
+
+    def page(self, cursor=None):
+        queryset = self.queryset.order_by(*self.ordering)
+        reverse = False
+        if cursor:
+            values, reverse = self.decode_cursor(cursor)
+            queryset = queryset.filter(self.keyset_filter(values, reverse))
+            if reverse:
+                queryset = queryset.reverse()
+
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if reverse:
+            objects.reverse()
+
+        # Going backward, there is always a next page and vice versa
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else bool(cursor)
+
+        next_cursor = previous_cursor = None
+        if objects and has_next:
+            next_cursor = self.encode_cursor(objects[-1], reverse=False)
+        if objects and has_previous:
+            previous_cursor = self.encode_cursor(objects[0], reverse=True)
+
+        return KeysetPage(objects, next_cursor, previous_cursor)
+
+    def keyset_filter(self, values, reverse):
+        """
+        (a, b) < (x, y) as (a < x) OR (a = x AND b < y),
+        comparison is chosen by direction of each field
+        """
+        keyset_q = Q()
+        equal_q = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-")
+            lookup = "lt" if descending != reverse else "gt"
+            keyset_q |= equal_q & Q(**{"{}__{}".format(name, lookup): value})
+            equal_q &= Q(**{name: value})
+        return keyset_q
+
+    def encode_cursor(self, obj, reverse):
+        values = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip("-"))
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            values.append(value)
+        return signing.dumps(
+            {"v": values, "r": reverse}, salt=self.cursor_salt, compress=True
+        )
+
+    def to_python(self, name, value):
+        """Model field value from cursor, annotations are kept as is"""
+        if name in self.queryset.query.annotations:
+            return value
+        opts = self.queryset.model._meta
+        return opts.get_field("id" if name == "pk" else name).to_python(value)
+
+    def decode_cursor(self, cursor):
+        try:
+            data = signing.loads(cursor, salt=self.cursor_salt)
+            raw_values, reverse = data["v"], bool(data["r"])
+            if len(raw_values) != len(self.ordering):
+                raise ValueError()
+
+            values = [
+                self.to_python(field.lstrip("-"), value)
+                for field, value in zip(self.ordering, raw_values)
+            ]
+        except (signing.BadSignature, ValidationError,
+                KeyError, TypeError, ValueError):
+            raise InvalidPage("Invalid cursor")
+
+        return values, reverse
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.utils import timezone
+
+
+def hot_score(score, published, now=None):
+    """
+    HN-like "hot" rank: votes divided by the question age in hours
+    raised to the power of gravity, so old questions sink over time.
+    The rank is not updated on votes, it's recomputed periodically
+    by the update_hot_scores command.
+    """
+    now = now or timezone.now()
+    age_hours = max((now - published).total_seconds(), 0) / 3600
+
+    return (score + 1) / pow(
+        age_hours + settings.HOT_SCORE_AGE_OFFSET, settings.HOT_SCORE_GRAVITY
+    )
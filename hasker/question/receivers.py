@@ -0,0 +1,180 @@
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .cache import (invalidate_top_questions, bump_list_version,
+                    bump_question_version)
+from .events import publish_question_event, question_has_subscribers
+from .models import Question, Answer, Tag, AnswerNotification
+from .signals import votes_changed
+from .suggest import suggest_index
+
+
+@receiver(post_save, sender=Answer)
+def increment_answers_count(sender, instance, created, **kwargs):
+    if created:
+        Question.objects.filter(pk=instance.question_id).update(
+            answers_count=F("answers_count") + 1,
+            last_activity=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Answer)
+def queue_answer_notification(sender, instance, created, **kwargs):
+    """Email to question author goes to outbox in the answer transaction"""
+    if not created:
+        return
+    recipient = instance.question.author
+    if recipient.email and recipient.pk != instance.author_id:
+        AnswerNotification.objects.create(answer=instance, recipient=recipient)
+
+
+@receiver(post_delete, sender=Answer)
+def decrement_answers_count(sender, instance, **kwargs):
+    Question.objects.filter(pk=instance.question_id).update(
+        answers_count=F("answers_count") - 1,
+        last_activity=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Question)
+def question_saved(sender, instance, created, **kwargs):
+    # New question gets the highest hot score and may enter the top
+    pks = None if created else [instance.pk]
+    # After commit, or a concurrent request caches the old block again
+    transaction.on_commit(lambda: invalidate_top_questions(pks))
+
+
+@receiver(post_delete, sender=Question)
+def question_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_top_questions([pk]))
+
+
+@receiver(votes_changed, sender=Question)
+def question_voted(sender, pks, **kwargs):
+    invalidate_top_questions(pks)
+
+
+def bump_page_versions(question_pks, lists=True):
+    """Invalidate cached anonymous pages after commit"""
+    def bump():
+        if lists:
+            bump_list_version()
+        for pk in question_pks:
+            bump_question_version(pk)
+
+    transaction.on_commit(bump)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    bump_page_versions([instance.pk])
+
+
+@receiver(m2m_changed, sender=Question.tags.through)
+def question_tags_changed(sender, instance, action, **kwargs):
+    if action.startswith("post_") and isinstance(instance, Question):
+        bump_page_versions([instance.pk])
+
+
+@receiver(post_save, sender=Answer)
+def answer_saved(sender, instance, created, **kwargs):
+    # Lists show answers count, so they are affected by new answers only
+    bump_page_versions([instance.question_id], lists=created)
+
+
+@receiver(post_delete, sender=Answer)
+def answer_deleted(sender, instance, **kwargs):
+    bump_page_versions([instance.question_id])
+
+
+@receiver(votes_changed, sender=Question)
+def question_votes_changed(sender, pks, **kwargs):
+    bump_page_versions(pks)
+
+
+@receiver(votes_changed, sender=Answer)
+def answer_votes_changed(sender, pks, **kwargs):
+    question_pks = set(Answer.objects.filter(pk__in=pks).values_list(
+        "question_id", flat=True
+    ))
+    bump_page_versions(question_pks, lists=False)
+
+
+@receiver(post_save, sender=Question)
+def update_suggest_question(sender, instance, **kwargs):
+    pk, title, score = instance.pk, instance.title, instance.score
+    transaction.on_commit(
+        lambda: suggest_index.add_question(pk, title, score)
+    )
+
+
+@receiver(post_delete, sender=Question)
+def remove_suggest_question(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: suggest_index.remove_question(pk))
+
+
+@receiver(post_save, sender=Tag)
+def update_suggest_tag(sender, instance, **kwargs):
+    name = instance.name
+    transaction.on_commit(lambda: suggest_index.add_tag(name))
+
+
+@receiver(post_delete, sender=Tag)
+def remove_suggest_tag(sender, instance, **kwargs):
+    name = instance.name
+    transaction.on_commit(lambda: suggest_index.remove_tag(name))
+
+
+@receiver(votes_changed, sender=Question)
+def question_scores_changed(sender, pks, **kwargs):
+    """New scores (one query) go to suggestions index and live events"""
+    # Sent on commit, so scores are up to date
+    scores = dict(
+        Question.objects.filter(pk__in=pks).values_list("pk", "score")
+    )
+    suggest_index.update_scores(scores)
+    for pk, score in scores.items():
+        publish_question_event(
+            pk, "score", {"id": "q_{}".format(pk), "score": score}
+        )
+
+
+@receiver(votes_changed, sender=Answer)
+def publish_answer_scores(sender, pks, **kwargs):
+    for pk, question_pk, score in Answer.objects.filter(
+        pk__in=pks
+    ).values_list("pk", "question_id", "score"):
+        publish_question_event(
+            question_pk, "score", {"id": "a_{}".format(pk), "score": score}
+        )
+
+
+@receiver(post_save, sender=Answer)
+def publish_new_answer(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    def publish():
+        # Nobody reads the stream, e.g. in WSGI mode
+        if not question_has_subscribers(instance.question_id):
+            return
+        # Rendered for any reader: without vote and accept controls
+        html = render_to_string("question/answer.html", {
+            "answer": instance,
+            "question": instance.question,
+            "user": AnonymousUser(),
+        })
+        publish_question_event(
+            instance.question_id, "answer",
+            {"id": "a_{}".format(instance.pk), "html": html}
+        )
+
+    transaction.on_commit(publish)
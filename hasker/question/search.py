@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Question
+
+# Name of relevance annotation of search results, higher is better
+RANK_FIELD = "search_rank"
+
+
+class ContainsSearchBackend:
+    """
+    Fallback for databases without full-text search:
+    substring match in title or text, no relevance
+    """
+
+    def search(self, queryset, phrase):
+        return queryset.filter(
+            Q(title__icontains=phrase) | Q(text__icontains=phrase)
+        ).order_by("-score", "-published")
+
+
+class SQLiteSearchBackend:
+    """
+    FTS5 table question_search (rowid is question id), filled by
+    triggers of 0009_question_search migration. Rank is bm25
+    with title weighted over text.
+    """
+    table = "question_search"
+    rank_sql = "-bm25({table}, 10.0, 1.0)"
+
+    @staticmethod
+    def match_query(phrase):
+        """Every word must occur, FTS5 syntax of the phrase is escaped"""
+        return " ".join(
+            '"{}"'.format(word.replace('"', '""')) for word in phrase.split()
+        )
+
+    def search(self, queryset, phrase):
+        query = self.match_query(phrase)
+        if not query:
+            return queryset.none()
+
+        question = Question._meta.db_table
+        where_sql = "{question}.id IN (" \
+                    "SELECT rowid FROM {table} WHERE {table} MATCH %s" \
+                    ")".format(question=question, table=self.table)
+        rank_sql = "SELECT {rank} FROM {table} WHERE {table} MATCH %s " \
+                   "AND rowid = {question}.id".format(
+                       rank=self.rank_sql.format(table=self.table),
+                       table=self.table,
+                       question=question
+                   )
+        # extra(), because RawSQL in pk__in is wrapped into
+        # parentheses and SQLite takes it as a scalar subquery
+        return queryset.extra(
+            where=[where_sql], params=[query]
+        ).annotate(
+            **{RANK_FIELD: RawSQL(rank_sql, [query])}
+        ).order_by("-" + RANK_FIELD, "-score", "-published")
+
+
+class PostgreSQLSearchBackend:
+    """
+    Stored tsvector column search_document of question table with
+    GIN index, maintained by trigger of 0009_question_search migration
+    (title has weight A, text - B)
+    """
+    config = "russian"
+
+    def search(self, queryset, phrase):
+        document = "{}.search_document".format(Question._meta.db_table)
+        query = "plainto_tsquery(%s, %s)"
+        return queryset.extra(
+            where=["{} @@ {}".format(document, query)],
+            params=[self.config, phrase]
+        ).annotate(**{RANK_FIELD: RawSQL(
+            "ts_rank_cd({}, {})".format(document, query),
+            [self.config, phrase]
+        )}).order_by("-" + RANK_FIELD, "-score", "-published")
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend(using="default"):
+    """SEARCH_BACKEND setting or backend of the database vendor"""
+    if settings.SEARCH_BACKEND:
+        return import_string(settings.SEARCH_BACKEND)()
+
+    vendor = connections[using].vendor
+    return VENDOR_BACKENDS.get(vendor, ContainsSearchBackend)()
+
+
+def search_questions(phrase, queryset=None):
+    """Questions matching the phrase, most relevant first"""
+    if queryset is None:
+        queryset = Question.objects.all()
+    return get_search_backend(queryset.db).search(queryset, phrase)
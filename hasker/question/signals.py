@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+
+# Sent after commit of vote()/vote_many() with sender=Question or Answer
+votes_changed = Signal(providing_args=["pks"])
@@ -0,0 +1,232 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from heapq import heappush, heappushpop
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Question, Tag
+
+WORD_RE = re.compile(r"\w+")
+
+
+def split_words(text):
+    return WORD_RE.findall(text.casefold())
+
+
+class PrefixIndex:
+    """Sorted array of (key, value) pairs with prefix lookup by bisect"""
+
+    def __init__(self, items=()):
+        self.items = sorted(items)
+
+    def add(self, key, value):
+        item = (key, value)
+        i = bisect_left(self.items, item)
+        if i == len(self.items) or self.items[i] != item:
+            self.items.insert(i, item)
+
+    def remove(self, key, value):
+        item = (key, value)
+        i = bisect_left(self.items, item)
+        if i < len(self.items) and self.items[i] == item:
+            del self.items[i]
+
+    def search(self, prefix):
+        """Values of keys starting with prefix, in key order"""
+        items = self.items
+        for i in range(bisect_left(items, (prefix,)), len(items)):
+            key, value = items[i]
+            if not key.startswith(prefix):
+                break
+            yield value
+
+
+class SuggestIndex:
+    """
+    In-memory index of question title words and tag names of the
+    worker process. It's loaded on first use (or by load() at worker
+    start), updated by receivers on save/delete and votes in this
+    process and rebuilt in a background thread after
+    SUGGEST_INDEX_MAX_AGE seconds to catch up with changes made by
+    other processes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Held by the only running rebuild
+        self.load_lock = threading.Lock()
+        self.reload_thread = None
+        self.loaded_at = None
+        self.questions = {}
+        self.words = PrefixIndex()
+        self.tags = PrefixIndex()
+
+    @property
+    def is_loaded(self):
+        return self.loaded_at is not None
+
+    def load(self):
+        with self.load_lock:
+            self._load()
+
+    def _load(self):
+        questions = {
+            pk: (title, score, set(split_words(title)))
+            for pk, title, score in Question.objects.values_list(
+                "pk", "title", "score"
+            ).iterator()
+        }
+        words = PrefixIndex(
+            (word, pk)
+            for pk, (title, score, title_words) in questions.items()
+            for word in title_words
+        )
+        tags = PrefixIndex(
+            (name.casefold(), name)
+            for name in Tag.objects.values_list("name", flat=True).iterator()
+        )
+
+        with self.lock:
+            self.questions, self.words, self.tags = questions, words, tags
+            self.loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        """
+        First request waits for the index, requests to the stale index
+        use it while one of them starts the rebuild
+        """
+        if not self.is_loaded:
+            with self.load_lock:
+                if not self.is_loaded:
+                    self._load()
+            return
+
+        max_age = settings.SUGGEST_INDEX_MAX_AGE
+        if time.monotonic() - self.loaded_at <= max_age:
+            return
+        if self.load_lock.acquire(blocking=False):
+            self.reload_thread = threading.Thread(
+                target=self._reload, name="suggest-reload", daemon=True
+            )
+            self.reload_thread.start()
+
+    def _reload(self):
+        try:
+            self._load()
+        finally:
+            self.load_lock.release()
+            # Database connection of the thread
+            connection.close()
+
+    def add_question(self, pk, title, score):
+        if not self.is_loaded:
+            return
+        with self.lock:
+            self._remove_question(pk)
+            title_words = set(split_words(title))
+            self.questions[pk] = (title, score, title_words)
+            for word in title_words:
+                self.words.add(word, pk)
+
+    def update_scores(self, scores):
+        """Update scores of indexed questions by {pk: score}"""
+        if not self.is_loaded:
+            return
+        with self.lock:
+            for pk, score in scores.items():
+                if pk in self.questions:
+                    title, old_score, title_words = self.questions[pk]
+                    self.questions[pk] = (title, score, title_words)
+
+    def remove_question(self, pk):
+        if not self.is_loaded:
+            return
+        with self.lock:
+            self._remove_question(pk)
+
+    def _remove_question(self, pk):
+        if pk not in self.questions:
+            return
+        title, score, title_words = self.questions.pop(pk)
+        for word in title_words:
+            self.words.remove(word, pk)
+
+    def add_tag(self, name):
+        if self.is_loaded:
+            with self.lock:
+                self.tags.add(name.casefold(), name)
+
+    def remove_tag(self, name):
+        if self.is_loaded:
+            with self.lock:
+                self.tags.remove(name.casefold(), name)
+
+    def suggest_questions(self, phrase, limit):
+        """
+        Questions with every word of the phrase being a prefix of
+        a title word, top by score. All candidates of the longest word
+        are checked, only the top limit of them is kept in a heap.
+        """
+        phrase_words = split_words(phrase)
+        if not phrase_words or limit <= 0:
+            return []
+        longest = max(phrase_words, key=len)
+
+        with self.lock:
+            checked = set()
+            # Min-heap of the best (score, pk, title) found
+            found = []
+            for pk in self.words.search(longest):
+                if pk in checked:
+                    continue
+                checked.add(pk)
+                title, score, title_words = self.questions[pk]
+                if all(
+                    any(word.startswith(phrase_word) for word in title_words)
+                    for phrase_word in phrase_words
+                ):
+                    if len(found) < limit:
+                        heappush(found, (score, pk, title))
+                    else:
+                        heappushpop(found, (score, pk, title))
+
+        found.sort(reverse=True)
+        return [(pk, title) for score, pk, title in found]
+
+    def suggest_tags(self, phrase, limit):
+        prefix = phrase.strip().casefold()
+        if not prefix:
+            return []
+        with self.lock:
+            tags = []
+            for name in self.tags.search(prefix):
+                tags.append(name)
+                if len(tags) >= limit:
+                    break
+        return tags
+
+
+suggest_index = SuggestIndex()
+
+
+def preload_suggest_index():
+    """
+    Load the index at worker start instead of first request. Forked
+    workers mustn't share the database connection of the loading one.
+    """
+    suggest_index.load()
+    connection.close()
+
+
+def get_suggestions(phrase, limit=None):
+    """Question (id, title) pairs and tag names for the typed phrase"""
+    if limit is None:
+        limit = settings.SUGGEST_LIMIT
+    suggest_index.ensure_loaded()
+    return (
+        suggest_index.suggest_questions(phrase, limit),
+        suggest_index.suggest_tags(phrase, limit),
+    )
@@ -0,0 +1,10 @@
+from django import template
+
+from ..cache import get_question_summaries
+
+register = template.Library()
+
+
+@register.simple_tag
+def question_summaries(questions):
+    return get_question_summaries(list(questions))
@@ -1,20 +1,60 @@
+import asyncio
+import sys
+import threading
+import time
 from datetime import datetime, timedelta
 
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
 from django.urls import reverse
+from django.core import paginator as paginator_module
 from django.http import (
     HttpResponseNotFound, HttpResponseBadRequest, HttpResponseNotAllowed,
     HttpResponseForbidden
 )
 
 from hasker.user.models import User
-from hasker.question.models import Question, Tag, Answer
+from hasker.question.models import (
+    Question, Tag, Answer, QuestionVote, AnswerVote, AnswerNotification
+)
+from hasker.question.cache import (
+    TOP_QUESTIONS_KEY, get_top_questions_html, get_question_summaries,
+    bump_list_version
+)
+from hasker.question.paginator import CachedCountPaginator, KeysetPaginator
+from hasker.question.views import QuestionList
+from hasker.question.search import search_questions
+from hasker.question.suggest import preload_suggest_index, suggest_index
+from hasker.question.forms import QuestionForm
+from hasker.question.notifications import send_notifications_batch
+from hasker.routers import PIN_COOKIE, ReplicaRouter
+from hasker.question.management.commands.check_query_plans import (
+    Command as CheckQueryPlansCommand
+)
+from hasker.question.management.commands.benchmark_asgi import (
+    asgi_get, get_scope
+)
+from hasker.question import aio
+from hasker.question.events import LocalBroker, subscribe_question
+from hasker.aio import run_in_thread
 
 
 class IndexViewTests(TestCase):
     questions = {}
 
     def setUp(self):
+        cache.clear()
         test_user = User.objects.create_user(
             username="test1",
             email="test1@mail.com",
@@ -47,6 +87,8 @@ class IndexViewTests(TestCase):
         )
         self.questions["question_3"].save()
 
+        call_command("update_hot_scores", stdout=StringIO())
+
     def test_questions_sorted_by_pub_date(self):
         response = self.client.get(reverse("question:home"))
 
@@ -76,6 +118,7 @@ class SearchViewTests(TestCase):
     questions = {}
 
     def setUp(self):
+        cache.clear()
         test_user = User.objects.create_user(
             username="test1",
             email="test1@mail.com",
@@ -166,11 +209,250 @@ class SearchViewTests(TestCase):
         )
 
 
+class FullTextSearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.in_text = Question.objects.create(
+            title="first", text="how to install python", author=self.author
+        )
+        self.in_title = Question.objects.create(
+            title="python install", text="text", author=self.author
+        )
+
+    def test_relevance_order(self):
+        self.assertListEqual(
+            list(search_questions("python install")),
+            [self.in_title, self.in_text]
+        )
+
+    def test_index_follows_changes(self):
+        self.in_text.text = "new text"
+        self.in_text.save()
+        self.assertListEqual(
+            list(search_questions("python")), [self.in_title]
+        )
+
+        self.in_title.delete()
+        self.assertListEqual(list(search_questions("python")), [])
+
+    def test_special_characters(self):
+        self.assertListEqual(list(search_questions('"python* AND (')), [])
+
+    def test_search_cursor_pagination(self):
+        url = reverse("question:search_results")
+        with mock.patch.object(QuestionList, "paginate_by", 1):
+            response = self.client.get(url, {"q": "python", "cursor": ""})
+            page = response.context["page_obj"]
+            self.assertListEqual(list(page), [self.in_title])
+
+            response = self.client.get(
+                url, {"q": "python", "cursor": page.next_cursor}
+            )
+            self.assertListEqual(
+                list(response.context["page_obj"]), [self.in_text]
+            )
+
+    @override_settings(
+        SEARCH_BACKEND="hasker.question.search.ContainsSearchBackend"
+    )
+    def test_contains_backend(self):
+        self.assertListEqual(
+            list(search_questions("to install")), [self.in_text]
+        )
+
+
+class SearchSuggestTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        suggest_index.loaded_at = None
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.python = Question.objects.create(
+            title="How to install Python?", text="text", author=self.author
+        )
+        self.pytest = Question.objects.create(
+            title="Pytest fixtures", text="text", author=self.author
+        )
+        Question.objects.filter(pk=self.pytest.pk).update(score=5)
+        Tag.objects.create(name="python")
+
+    def get_suggestions(self, phrase):
+        response = self.client.get(
+            reverse("question:search_suggest"), {"q": phrase}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_suggest(self):
+        data = self.get_suggestions("py")
+        self.assertListEqual(
+            [question["id"] for question in data["questions"]],
+            [self.pytest.pk, self.python.pk]
+        )
+        self.assertEqual(data["questions"][1]["url"], self.python.url)
+        self.assertListEqual(data["tags"], ["python"])
+
+        data = self.get_suggestions("inst pyth")
+        self.assertListEqual(
+            [question["title"] for question in data["questions"]],
+            [self.python.title]
+        )
+        self.assertListEqual(self.get_suggestions("")["questions"], [])
+
+    def test_incremental_update(self):
+        self.get_suggestions("py")
+        with self.assertNumQueries(0):
+            self.get_suggestions("py")
+
+        self.python.title = "Install Ruby"
+        self.python.save()
+        Question.objects.create(
+            title="Python 3", text="text", author=self.author
+        )
+        self.pytest.delete()
+        Tag.objects.create(name="pypy")
+
+        with self.assertNumQueries(0):
+            data = self.get_suggestions("py")
+        self.assertListEqual(
+            [question["title"] for question in data["questions"]],
+            ["Python 3"]
+        )
+        self.assertListEqual(data["tags"], ["pypy", "python"])
+
+    def test_vote_updates_score(self):
+        self.get_suggestions("py")
+        for i in range(6):
+            self.python.vote(User.objects.create_user(
+                username="voter{}".format(i), password="password"
+            ))
+
+        with self.assertNumQueries(0):
+            data = self.get_suggestions("py")
+        self.assertListEqual(
+            [question["id"] for question in data["questions"]],
+            [self.python.pk, self.pytest.pk]
+        )
+
+    def test_top_of_all_candidates(self):
+        # Words of other questions come before "pytest" in the index
+        for i in range(30):
+            Question.objects.create(
+                title="Pyramid {}".format(i), text="text", author=self.author
+            )
+        suggest_index.load()
+        top = suggest_index.suggest_questions("py", 3)
+        self.assertEqual(len(top), 3)
+        self.assertEqual(top[0], (self.pytest.pk, self.pytest.title))
+
+    def test_preload_closes_connection(self):
+        with mock.patch("hasker.question.suggest.connection") as connection:
+            preload_suggest_index()
+        connection.close.assert_called_once_with()
+        self.assertTrue(suggest_index.is_loaded)
+
+    @override_settings(SUGGEST_INDEX_MAX_AGE=0)
+    def test_stale_index_reloads_in_background(self):
+        self.get_suggestions("py")
+        Question.objects.filter(pk=self.python.pk).update(title="Ruby")
+        time.sleep(0.01)
+
+        # Served by the stale index, rebuilt in a thread
+        self.get_suggestions("py")
+        suggest_index.reload_thread.join()
+        self.assertListEqual(
+            [pk for pk, title in suggest_index.suggest_questions("py", 10)],
+            [self.pytest.pk]
+        )
+
+
+class TagsAutocompleteTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        for name in ("python", "python3", "pytest", "django"):
+            Tag.objects.create(name=name)
+
+    def test_search_tags(self):
+        response = self.client.get(
+            reverse("question:tag:search"), {"q": "Pyt"}
+        )
+        self.assertListEqual(
+            response.json()["tags"], ["pytest", "python", "python3"]
+        )
+
+    def test_add_tag(self):
+        url = reverse("question:tag:add")
+        response = self.client.get(url, {"tag": "new"})
+        self.assertEqual(
+            response.status_code, HttpResponseNotAllowed.status_code
+        )
+
+        self.client.login(username="author", password="password")
+        response = self.client.post(url, {"tag": " New "})
+        self.assertEqual(response.content.decode(), "new")
+        self.assertTrue(Tag.objects.filter(name="new").exists())
+
+        response = self.client.post(url, {"tag": "a,b"})
+        self.assertEqual(
+            response.status_code, HttpResponseBadRequest.status_code
+        )
+
+    def test_form_tags_validation(self):
+        form = QuestionForm(data={
+            "title": "title", "text": "text", "tags": "Python, django,python"
+        })
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        self.assertListEqual(
+            [tag.name for tag in form.cleaned_data["tags"]],
+            ["python", "django"]
+        )
+
+        form = QuestionForm(data={
+            "title": "title", "text": "text", "tags": "python, unknown"
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn("unknown", form.errors["tags"][0])
+
+    def test_edit_form_initial_tags(self):
+        question = Question.objects.create(
+            title="title", text="text", author=self.author
+        )
+        question.tags.add("python", "django")
+        self.client.login(username="author", password="password")
+        response = self.client.get(
+            reverse("question:edit", kwargs={"id": question.pk})
+        )
+        self.assertContains(response, 'value="django, python"')
+
+        response = self.client.post(
+            reverse("question:edit", kwargs={"id": question.pk}),
+            {"title": "title", "text": "text", "tags": "pytest"}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertListEqual(
+            [tag.name for tag in question.tags.all()], ["pytest"]
+        )
+
+
 class VoteViewTests(TestCase):
 
     def clear_likers_dislikers(self, question: Question):
-        question.likers.clear()
-        question.dislikers.clear()
+        question.vote_set.all().delete()
+
+    def get_question_votes(self):
+        self.question.refresh_from_db()
+        return self.question.votes
 
     def setUp(self):
         self.credentials = {
@@ -294,7 +576,7 @@ class VoteViewTests(TestCase):
         self.client.login(**self.credentials)
         self.clear_likers_dislikers(self.question)
 
-        q_votes_start = self.question.votes
+        q_votes_start = self.get_question_votes()
 
         self.client.post(
             reverse("question:vote"),
@@ -315,7 +597,7 @@ class VoteViewTests(TestCase):
             HTTP_X_REQUESTED_WITH='XMLHttpRequest'
         )
 
-        q_votes_end = self.question.votes
+        q_votes_end = self.get_question_votes()
 
         self.assertEqual(q_votes_start, q_votes_end)
 
@@ -333,7 +615,7 @@ class VoteViewTests(TestCase):
             HTTP_X_REQUESTED_WITH='XMLHttpRequest'
         )
 
-        q_votes = self.question.votes
+        q_votes = self.get_question_votes()
 
         self.client.post(
             reverse("question:vote"),
@@ -345,7 +627,7 @@ class VoteViewTests(TestCase):
             HTTP_X_REQUESTED_WITH='XMLHttpRequest'
         )
 
-        new_q_votes = self.question.votes
+        new_q_votes = self.get_question_votes()
 
         self.assertEqual(q_votes-2, new_q_votes)
 
@@ -353,7 +635,7 @@ class VoteViewTests(TestCase):
         self.client.login(**self.credentials)
         self.clear_likers_dislikers(self.question)
 
-        q_votes = self.question.votes
+        q_votes = self.get_question_votes()
         response = self.client.post(
             reverse("question:vote"),
             data={
@@ -364,7 +646,7 @@ class VoteViewTests(TestCase):
             HTTP_X_REQUESTED_WITH='XMLHttpRequest'
         )
 
-        new_q_votes = self.question.votes
+        new_q_votes = self.get_question_votes()
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(q_votes+1, new_q_votes)
@@ -373,7 +655,7 @@ class VoteViewTests(TestCase):
         self.client.login(**self.credentials)
         self.clear_likers_dislikers(self.question)
 
-        q_votes = self.question.votes
+        q_votes = self.get_question_votes()
         response = self.client.post(
             reverse("question:vote"),
             data={
@@ -384,7 +666,971 @@ class VoteViewTests(TestCase):
             HTTP_X_REQUESTED_WITH='XMLHttpRequest'
         )
 
-        new_q_votes = self.question.votes
+        new_q_votes = self.get_question_votes()
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(q_votes-1, new_q_votes)
+
+
+class VoteCountersTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(
+            username="voter", password="password"
+        )
+        self.question = Question.objects.create(
+            title="question", text="question", author=self.author
+        )
+        self.answer = self.question.answers.create(
+            text="answer", author=self.author
+        )
+
+    def test_vote_updates_counters(self):
+        self.question.vote(self.user, like=True)
+        self.assertEqual(
+            (self.question.likes, self.question.dislikes, self.question.score),
+            (1, 0, 1)
+        )
+
+        self.question.vote(self.user, like=False)
+        self.assertEqual(
+            (self.question.likes, self.question.dislikes, self.question.score),
+            (0, 1, -1)
+        )
+
+        self.question.vote(self.user, like=False)
+        self.assertEqual(
+            (self.question.likes, self.question.dislikes, self.question.score),
+            (0, 0, 0)
+        )
+
+    def test_vote_stores_single_row(self):
+        self.question.vote(self.user, like=True)
+        self.question.vote(self.user, like=False)
+        self.assertListEqual(
+            list(self.question.vote_set.values_list("user", "value")),
+            [(self.user.pk, QuestionVote.DISLIKE)]
+        )
+
+    def test_answer_vote_updates_counters(self):
+        self.answer.vote(self.user, like=False)
+        self.answer.refresh_from_db()
+        self.assertEqual(self.answer.votes, -1)
+
+    def test_rebuild_vote_counters(self):
+        self.question.vote_set.create(user=self.user, value=QuestionVote.LIKE)
+        self.answer.vote_set.create(user=self.user, value=AnswerVote.DISLIKE)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "rebuild_vote_counters", check=True, stdout=StringIO()
+            )
+
+        call_command("rebuild_vote_counters", stdout=StringIO())
+        self.question.refresh_from_db()
+        self.answer.refresh_from_db()
+        self.assertEqual(self.question.score, 1)
+        self.assertEqual(self.answer.score, -1)
+
+        call_command("rebuild_vote_counters", check=True, stdout=StringIO())
+
+
+class AnswersCountTests(TestCase):
+
+    def setUp(self):
+        self.credentials = {"username": "answerer", "password": "password"}
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(**self.credentials)
+        self.question = Question.objects.create(
+            title="question", text="question", author=self.author
+        )
+
+    def test_answer_create_increments_count(self):
+        self.client.login(**self.credentials)
+        self.client.post(
+            reverse("question:detail", kwargs={"id": self.question.pk}),
+            data={"text": "answer"}
+        )
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.answers_count, 1)
+
+    def test_answer_delete_decrements_count(self):
+        answer = self.question.answers.create(text="answer", author=self.user)
+        self.question.answers.create(text="answer 2", author=self.user)
+        answer.delete()
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.answers_count, 1)
+
+    def test_stale_question_edit_keeps_count(self):
+        form = QuestionForm(
+            {"title": "new title", "text": "new text", "tags": ""},
+            instance=self.question
+        )
+        self.question.answers.create(text="answer", author=self.user)
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.title, "new title")
+        self.assertEqual(self.question.answers_count, 1)
+
+    def test_choose_correct_answer_keeps_count(self):
+        answer = self.question.answers.create(
+            text="answer", author=self.user
+        )
+        self.client.get(reverse(
+            "question:choose_correct_answer", kwargs={"a_id": answer.pk}
+        ))
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.correct_answer, answer)
+        self.assertEqual(self.question.answers_count, 1)
+
+    def test_answer_author_delete_decrements_count(self):
+        self.question.answers.create(text="answer", author=self.user)
+        self.user.delete()
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.answers_count, 0)
+
+
+class HotScoreTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+
+    def create_question(self, title, score, age):
+        question = Question.objects.create(
+            title=title, text=title, author=self.author
+        )
+        Question.objects.filter(pk=question.pk).update(
+            score=score, published=timezone.now() - age
+        )
+        return question
+
+    def test_old_questions_sink(self):
+        old = self.create_question("old", score=10, age=timedelta(days=30))
+        new = self.create_question("new", score=2, age=timedelta(hours=1))
+        call_command("update_hot_scores", stdout=StringIO())
+
+        response = self.client.get(reverse("question:hot"))
+        self.assertListEqual(list(response.context["questions"]), [new, old])
+
+    def test_new_question_gets_hot_score(self):
+        question = self.create_question("new", score=0, age=timedelta())
+        self.assertGreater(question.hot_score, 0)
+
+
+class TopQuestionsCacheTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(
+            username="voter", password="password"
+        )
+        self.question = Question.objects.create(
+            title="first", text="first", author=self.author
+        )
+
+    def test_top_questions_cached(self):
+        get_top_questions_html()
+        with self.assertNumQueries(0):
+            html = get_top_questions_html()
+        self.assertIn("first", html)
+
+    def test_new_question_invalidates_cache(self):
+        get_top_questions_html()
+        Question.objects.create(
+            title="second", text="second", author=self.author
+        )
+        self.assertIn("second", get_top_questions_html())
+
+    def test_invalidated_after_commit(self):
+        get_top_questions_html()
+        with transaction.atomic():
+            Question.objects.create(
+                title="second", text="second", author=self.author
+            )
+            # Block cached by a concurrent request before the commit
+            self.assertIsNotNone(cache.get(TOP_QUESTIONS_KEY))
+        self.assertIsNone(cache.get(TOP_QUESTIONS_KEY))
+
+    def test_vote_invalidates_cache(self):
+        self.assertIn("<span>0</span>", get_top_questions_html())
+        self.question.vote(self.user, like=True)
+        self.assertIn("<span>1</span>", get_top_questions_html())
+
+
+class AnonymousPageCacheTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.credentials = {"username": "answerer", "password": "password"}
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(**self.credentials)
+        self.question = Question.objects.create(
+            title="question", text="question", author=self.author
+        )
+        self.detail_url = reverse(
+            "question:detail", kwargs={"id": self.question.pk}
+        )
+
+    def test_anonymous_page_cached(self):
+        self.client.get(reverse("question:home"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("question:home"))
+        self.assertContains(response, "question")
+
+    def test_page_number_in_key(self):
+        self.client.get(reverse("question:home"))
+        with self.assertNumQueries(0):
+            self.client.get(reverse("question:home"))
+        response = self.client.get(reverse("question:home") + "?page=1")
+        self.assertIsNotNone(response.context)
+
+    def test_authenticated_page_not_cached(self):
+        self.client.login(**self.credentials)
+        self.client.get(reverse("question:home"))
+        response = self.client.get(reverse("question:home"))
+        self.assertIsNotNone(response.context)
+
+    def test_new_answer_invalidates_pages(self):
+        self.client.get(reverse("question:home"))
+        self.client.get(self.detail_url)
+
+        self.question.answers.create(text="new answer", author=self.user)
+
+        self.assertContains(self.client.get(self.detail_url), "new answer")
+        response = self.client.get(reverse("question:home"))
+        self.assertEqual(response.context["questions"][0].answers_count, 1)
+
+    def test_vote_invalidates_pages(self):
+        self.client.get(self.detail_url)
+        self.question.vote(self.user, like=True)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.context["question"].votes, 1)
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.question = Question.objects.create(
+            title="question", text="question", author=self.author
+        )
+        self.url = reverse("question:detail", kwargs={"id": self.question.pk})
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_answer_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.question.answers.create(text="answer", author=self.author)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_votes_move_last_activity(self):
+        # Set in the vote transaction, on_commit doesn't run in TestCase
+        answer = self.question.answers.create(
+            text="answer", author=self.author
+        )
+        voter = User.objects.create_user(username="voter")
+        for obj in (self.question, answer):
+            before = Question.objects.get(pk=self.question.pk).last_activity
+            obj.vote(voter)
+            self.assertGreater(
+                Question.objects.get(pk=self.question.pk).last_activity,
+                before
+            )
+
+    def test_etag_depends_on_user(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.login(username="author", password="password")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class QuestionSummaryCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(
+            username="voter", password="password"
+        )
+        tag = Tag.objects.create(name="foo")
+        for i in range(3):
+            question = Question.objects.create(
+                title="question {}".format(i), text="text", author=self.author
+            )
+            question.tags.add(tag)
+
+    def test_summaries_cached(self):
+        get_question_summaries(list(Question.objects.all()))
+
+        questions = list(Question.objects.all())
+        with self.assertNumQueries(0):
+            summaries = get_question_summaries(questions)
+        self.assertEqual(len(summaries), 3)
+        self.assertIn("foo", summaries[0][1])
+
+    def test_vote_changes_summary(self):
+        get_question_summaries(list(Question.objects.all()))
+        question = Question.objects.first()
+        question.vote(self.user)
+
+        summaries = get_question_summaries([question])
+        self.assertIn("<span>1</span>", summaries[0][1])
+
+    def test_list_page_renders_summaries(self):
+        response = self.client.get(reverse("question:home"))
+        self.assertContains(response, "question 2")
+        self.assertContains(response, "Спросил")
+
+
+class CachedCountPaginatorTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        for i in range(3):
+            Question.objects.create(
+                title="question {}".format(i), text="text", author=self.author
+            )
+
+    def test_count_cached(self):
+        self.assertEqual(
+            CachedCountPaginator(Question.objects.all(), 2).count, 3
+        )
+        with self.assertNumQueries(0):
+            paginator = CachedCountPaginator(Question.objects.all(), 2)
+            self.assertEqual(paginator.num_pages, 2)
+
+    def test_count_depends_on_filter(self):
+        CachedCountPaginator(Question.objects.all(), 2).count
+        paginator = CachedCountPaginator(
+            Question.objects.filter(title="question 1"), 2
+        )
+        self.assertEqual(paginator.count, 1)
+
+    def test_list_version_invalidates_count(self):
+        CachedCountPaginator(Question.objects.all(), 2).count
+        Question.objects.create(title="new", text="text", author=self.author)
+        bump_list_version()
+
+        paginator = CachedCountPaginator(Question.objects.all(), 2)
+        self.assertEqual(paginator.count, 4)
+
+    def test_known_count(self):
+        with self.assertNumQueries(0):
+            paginator = CachedCountPaginator(
+                Question.objects.all(), 2, count=10
+            )
+            self.assertEqual(paginator.num_pages, 5)
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        now = timezone.now()
+        for i in range(5):
+            question = Question.objects.create(
+                title="question {}".format(i), text="text", author=self.author
+            )
+            # Two questions with the same date to check id tiebreaker
+            Question.objects.filter(pk=question.pk).update(
+                published=now - timedelta(days=i // 2)
+            )
+        self.expected = list(
+            Question.objects.order_by("-published", "-id")
+        )
+
+    def test_pages_cover_all_objects(self):
+        paginator = KeysetPaginator(
+            Question.objects.order_by("-published"), 2
+        )
+        page = paginator.page()
+        objects = list(page)
+        self.assertFalse(page.has_previous())
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            objects.extend(page)
+        self.assertEqual(objects, self.expected)
+
+        previous_page = paginator.page(page.previous_cursor)
+        self.assertEqual(list(previous_page), self.expected[2:4])
+        self.assertTrue(previous_page.has_next())
+        self.assertTrue(previous_page.has_previous())
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(Question.objects.all(), 2)
+        with self.assertRaises(paginator_module.InvalidPage):
+            paginator.page("bad-cursor")
+
+    def test_list_view_cursor(self):
+        with mock.patch.object(QuestionList, "paginate_by", 2):
+            url = reverse("question:home")
+            response = self.client.get(url, {"cursor": ""})
+            page = response.context["page_obj"]
+            self.assertEqual(list(page), self.expected[:2])
+            self.assertTrue(response.context["cursor_pagination"])
+
+            response = self.client.get(url, {"cursor": page.next_cursor})
+            self.assertEqual(
+                list(response.context["page_obj"]), self.expected[2:4]
+            )
+
+            response = self.client.get(url, {"cursor": "bad-cursor"})
+            self.assertEqual(
+                response.status_code, HttpResponseNotFound.status_code
+            )
+
+    @override_settings(PAGINATION_MODE="cursor")
+    def test_cursor_mode_setting(self):
+        response = self.client.get(reverse("question:home"))
+        self.assertTrue(response.context["cursor_pagination"])
+        self.assertIsNone(response.context["paginator"])
+
+
+class CheckQueryPlansTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        author = User.objects.create_user(
+            username="author", password="password"
+        )
+        question = Question.objects.create(
+            title="question", text="text", author=author
+        )
+        question.tags.add(Tag.objects.create(name="tag"))
+        Answer.objects.create(question=question, text="text", author=author)
+
+    def test_canonical_queries_use_indexes(self):
+        out = StringIO()
+        call_command("check_query_plans", min_rows=0, stdout=out)
+        self.assertIn("home: OK", out.getvalue())
+        self.assertIn("answers: OK", out.getvalue())
+        self.assertIn("tag: sort on", out.getvalue())
+
+    def test_problems_reported(self):
+        command = CheckQueryPlansCommand(stdout=StringIO())
+        command.connection = connection
+        command.min_rows = 1
+        command.table_rows = {}
+        command.verbosity = 1
+
+        queryset = Question.objects.order_by("text")
+        self.assertListEqual(command.check_plan("text", queryset), [
+            "sequential scan on question_question",
+            "sort on question_question",
+        ])
+        self.assertListEqual(
+            command.check_plan("text", queryset, expected=("sort",)),
+            ["sequential scan on question_question"]
+        )
+
+        command.min_rows = 2
+        self.assertListEqual(command.check_plan("text", queryset), [])
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.author.save(using="replica")
+        # Replica lags behind primary
+        self.question = Question.objects.create(
+            title="primary title", text="text", author=self.author
+        )
+        self.question.save(using="replica")
+        Question.objects.using("replica").filter(
+            pk=self.question.pk
+        ).update(title="replica title")
+
+    def test_get_views_read_replica(self):
+        response = self.client.get(reverse("question:home"))
+        self.assertContains(response, "replica title")
+
+        response = self.client.get(self.question.url)
+        self.assertContains(response, "replica title")
+
+        response = self.client.get(reverse(
+            "user:profile", kwargs={"username": self.author.username}
+        ))
+        self.assertContains(response, "replica title")
+
+    def test_write_pins_to_primary(self):
+        User.objects.create_user(
+            username="user", password="password"
+        ).save(using="replica")
+        self.client.login(username="user", password="password")
+        response = self.client.post(self.question.url, {"text": "answer"})
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(Answer.objects.using("replica").count(), 0)
+
+        response = self.client.get(self.question.url)
+        self.assertContains(response, "primary title")
+        self.assertContains(response, "answer")
+
+        del self.client.cookies[PIN_COOKIE]
+        response = self.client.get(self.question.url)
+        self.assertContains(response, "replica title")
+
+    def test_other_reads_use_primary(self):
+        self.assertEqual(
+            Question.objects.get(pk=self.question.pk).title, "primary title"
+        )
+        self.assertEqual(ReplicaRouter().db_for_write(Question), "default")
+
+    def test_data_migrations_run_on_primary(self):
+        router = ReplicaRouter()
+        self.assertFalse(
+            router.allow_migrate("replica", "question", data_migration=True)
+        )
+        self.assertIsNone(
+            router.allow_migrate("default", "question", data_migration=True)
+        )
+        # Vendor schema of full-text search has no model_name
+        self.assertIsNone(router.allow_migrate("replica", "question"))
+
+    def test_replica_has_search_schema(self):
+        with connections["replica"].cursor() as cursor:
+            tables = connections["replica"].introspection.table_names(cursor)
+        if connections["replica"].vendor == "sqlite":
+            self.assertIn("question_search", tables)
+
+
+class AnswerNotificationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", email="author@mail.com", password="password"
+        )
+        self.user = User.objects.create_user(
+            username="user", password="password"
+        )
+        self.question = Question.objects.create(
+            title="question", text="text", author=self.author
+        )
+
+    def add_answers(self, count):
+        for i in range(count):
+            Answer.objects.create(
+                question=self.question, text="answer", author=self.user
+            )
+
+    def test_answer_queues_notification(self):
+        self.client.login(username="user", password="password")
+        self.client.post(self.question.url, {"text": "answer"})
+        self.assertEqual(len(mail.outbox), 0)
+
+        notification = AnswerNotification.objects.get()
+        self.assertEqual(notification.recipient, self.author)
+        self.assertEqual(notification.answer.text, "answer")
+
+    def test_send_batch_with_one_connection(self):
+        self.add_answers(1)
+        other_question = Question.objects.create(
+            title="other question", text="text", author=self.author
+        )
+        Answer.objects.create(
+            question=other_question, text="answer", author=self.user
+        )
+        with mock.patch(
+            "hasker.question.notifications.get_connection",
+            wraps=get_connection
+        ) as connection_mock:
+            call_command(
+                "send_notifications", batch_size=5, stdout=StringIO()
+            )
+        connection_mock.assert_called_once_with()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertListEqual(mail.outbox[0].to, ["author@mail.com"])
+        self.assertFalse(
+            AnswerNotification.objects.filter(sent__isnull=True).exists()
+        )
+
+        call_command("send_notifications", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_full_batch_of_one_digest(self):
+        # First batch is one email, the queue must still be drained
+        self.add_answers(2)
+        other_question = Question.objects.create(
+            title="other question", text="text", author=self.author
+        )
+        Answer.objects.create(
+            question=other_question, text="answer", author=self.user
+        )
+        call_command("send_notifications", batch_size=2, stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(
+            AnswerNotification.objects.filter(sent__isnull=True).exists()
+        )
+
+    def test_digest(self):
+        self.add_answers(3)
+        # claim in savepoint (select, update), last sent, mark sent
+        with self.assertNumQueries(6):
+            self.assertEqual(send_notifications_batch(10, 5), (3, 1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("(3)", mail.outbox[0].subject)
+        self.assertEqual(mail.outbox[0].body.count("Ответ от пользователя"), 3)
+
+        # Next answers wait for the end of the digest window
+        self.add_answers(2)
+        self.assertEqual(send_notifications_batch(10, 5), (2, 0, 0))
+        notification = AnswerNotification.objects.filter(
+            sent__isnull=True
+        ).first()
+        sent = AnswerNotification.objects.exclude(sent=None).first().sent
+        self.assertEqual(
+            notification.send_after,
+            sent + timedelta(seconds=settings.NOTIFICATION_DIGEST_WINDOW)
+        )
+
+        AnswerNotification.objects.update(
+            sent=F("sent") - timedelta(days=1)
+        )
+        AnswerNotification.objects.filter(sent=None).update(
+            send_after=timezone.now()
+        )
+        self.assertEqual(send_notifications_batch(10, 5), (2, 1, 0))
+        self.assertIn("(2)", mail.outbox[1].subject)
+
+    def test_retry_with_backoff(self):
+        self.add_answers(1)
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("smtp is down")
+        ):
+            self.assertEqual(send_notifications_batch(10, 2), (1, 0, 1))
+
+        notification = AnswerNotification.objects.get()
+        self.assertEqual(notification.attempts, 1)
+        self.assertIn("smtp is down", notification.last_error)
+        self.assertGreater(notification.send_after, timezone.now())
+        # Not retried before the delay
+        self.assertEqual(send_notifications_batch(10, 2), (0, 0, 0))
+
+        AnswerNotification.objects.update(send_after=timezone.now())
+        self.assertEqual(send_notifications_batch(10, 2), (1, 1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_max_attempts(self):
+        self.add_answers(1)
+        AnswerNotification.objects.update(attempts=2)
+        self.assertEqual(send_notifications_batch(10, 2), (0, 0, 0))
+
+    def test_prune_sent(self):
+        self.add_answers(2)
+        call_command("send_notifications", stdout=StringIO())
+        old = AnswerNotification.objects.first()
+        AnswerNotification.objects.filter(pk=old.pk).update(
+            sent=F("sent") - timedelta(
+                seconds=settings.NOTIFICATION_KEEP_SENT + 1
+            )
+        )
+
+        out = StringIO()
+        call_command("send_notifications", stdout=out)
+        self.assertIn("Deleted 1 old sent notifications", out.getvalue())
+        self.assertEqual(AnswerNotification.objects.count(), 1)
+
+    @override_settings(SITE_URL="https://hasker.test")
+    def test_email_escapes_user_input(self):
+        Answer.objects.create(
+            question=self.question, author=self.user,
+            text='<a href="http://evil.test">click</a>'
+        )
+        send_notifications_batch(10, 5)
+        body = mail.outbox[0].body
+        self.assertNotIn('<a href="http://evil.test">', body)
+        self.assertIn("&lt;a href=", body)
+        self.assertIn(
+            'href="https://hasker.test{}"'.format(self.question.url), body
+        )
+
+
+class QueryCountTests(TestCase):
+    """Pages must run the same number of queries for any page size"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(
+            username="answerer", password="password"
+        )
+        self.tag = Tag.objects.create(name="foo")
+
+    def create_questions(self, count):
+        for i in range(count):
+            question = Question.objects.create(
+                title="question {}".format(i), text="text", author=self.author
+            )
+            question.tags.add(self.tag)
+            for j in range(count):
+                question.answers.create(text="answer", author=self.user)
+            question.vote(self.user)
+        return question
+
+    def assert_page_queries(self, num, url):
+        cache.clear()
+        with self.assertNumQueries(num):
+            self.client.get(url)
+
+    def test_list_page(self):
+        # count, questions, tags, sidebar
+        for size in (2, 5):
+            self.create_questions(size)
+            self.assert_page_queries(4, reverse("question:home"))
+            self.assert_page_queries(4, reverse("question:hot"))
+
+    def test_detail_page(self):
+        # validators, question, tags, answers, sidebar
+        for size in (2, 5):
+            question = self.create_questions(size)
+            question.correct_answer = question.answers.first()
+            question.save(update_fields=["correct_answer"])
+            self.assert_page_queries(
+                5, reverse("question:detail", kwargs={"id": question.pk})
+            )
+
+    def test_profile_page(self):
+        # user, questions, answers, sidebar
+        for size in (2, 5):
+            self.create_questions(size)
+            self.assert_page_queries(
+                4, reverse("user:profile", kwargs={"username": "author"})
+            )
+            self.assert_page_queries(
+                4, reverse("user:profile", kwargs={"username": "answerer"})
+            )
+
+
+class ASGITests(TransactionTestCase):
+    """WSGI application served in threads of hasker.aio pool"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.question = Question.objects.create(
+            title="question", text="text", author=self.author
+        )
+
+    def run_async(self, coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    def test_asgi_application(self):
+        from hasker.asgi import application
+
+        for path in ("/", self.question.url):
+            status = self.run_async(asgi_get(application, path))
+            self.assertEqual(status, 200)
+        status = self.run_async(asgi_get(application, "/question/0/"))
+        self.assertEqual(status, 404)
+
+    def test_wsgi_in_pool_threads(self):
+        from hasker.asgi import ThreadedWsgiToAsgi
+
+        calls = []
+
+        def wsgi_application(environ, start_response):
+            calls.append((threading.current_thread(), environ["wsgi.errors"]))
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            return [b"first", b"second"]
+
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            messages.append(message)
+
+        self.run_async(ThreadedWsgiToAsgi(wsgi_application)(
+            get_scope("/"), receive, send
+        ))
+        thread, errors = calls[0]
+        self.assertTrue(thread.name.startswith("hasker"))
+        self.assertIs(errors, sys.stderr)
+        # Chunks are sent as the application yields them
+        self.assertListEqual(
+            [message.get("body") for message in messages[1:]],
+            [b"first", b"second", None]
+        )
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_asgi", requests=3, latency=1, stdout=out)
+        self.assertIn("Speedup", out.getvalue())
+
+
+@override_settings(EVENTS_BROKER="hasker.question.events.LocalBroker")
+class QuestionEventsTests(TransactionTestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(
+            username="user", password="password"
+        )
+        self.question = Question.objects.create(
+            title="question", text="text", author=self.author
+        )
+        self.loop = asyncio.get_event_loop()
+
+    def get_event(self, subscription):
+        return self.loop.run_until_complete(
+            asyncio.wait_for(subscription.get(), 1)
+        )
+
+    def test_local_broker(self):
+        broker = LocalBroker()
+        subscription = broker.subscribe("channel")
+        other = broker.subscribe("other")
+        self.loop.run_until_complete(run_in_thread(
+            broker.publish, "channel", {"type": "score"}
+        ))
+        self.assertEqual(self.get_event(subscription), {"type": "score"})
+        self.assertTrue(other.queue.empty())
+
+        self.assertTrue(broker.has_subscribers("channel"))
+        subscription.close()
+        other.close()
+        self.assertEqual(broker.subscriptions, {})
+        self.assertFalse(broker.has_subscribers("channel"))
+
+    def test_vote_and_answer_events(self):
+        with subscribe_question(self.question.pk) as subscription:
+            self.question.vote(self.user)
+            self.assertEqual(self.get_event(subscription), {
+                "type": "score",
+                "data": {"id": "q_{}".format(self.question.pk), "score": 1},
+            })
+
+            answer = self.question.answers.create(
+                text="new answer", author=self.user
+            )
+            event = self.get_event(subscription)
+            self.assertEqual(event["type"], "answer")
+            self.assertEqual(event["data"]["id"], "a_{}".format(answer.pk))
+            self.assertIn("new answer", event["data"]["html"])
+            self.assertNotIn("arr_up", event["data"]["html"])
+
+            answer.vote(self.author, like=False)
+            self.assertEqual(self.get_event(subscription)["data"], {
+                "id": "a_{}".format(answer.pk), "score": -1
+            })
+
+    def test_answer_not_rendered_without_subscribers(self):
+        with mock.patch(
+            "hasker.question.receivers.render_to_string"
+        ) as render:
+            self.question.answers.create(text="answer", author=self.user)
+        render.assert_not_called()
+
+    def stream(self, pk, action=None):
+        """Messages sent by the events handler until action is done"""
+        messages = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        async def wait_messages(count):
+            while len(messages) < count:
+                await asyncio.sleep(0.01)
+
+        async def run():
+            handler = asyncio.ensure_future(aio.question_events(
+                {"type": "http", "method": "GET"}, receive, send, str(pk)
+            ))
+            if action is not None:
+                await wait_messages(2)
+                await run_in_thread(action)
+                await wait_messages(3)
+            disconnected.set()
+            await handler
+
+        self.loop.run_until_complete(asyncio.wait_for(run(), 5))
+        return messages
+
+    def test_events_stream(self):
+        messages = self.stream(
+            self.question.pk, lambda: self.question.vote(self.user)
+        )
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertIn(
+            (b"content-type", b"text/event-stream"), messages[0]["headers"]
+        )
+        self.assertEqual(messages[1]["body"], b"retry: 5000\n\n")
+        self.assertEqual(
+            messages[2]["body"],
+            'event: score\ndata: {{"id": "q_{}", "score": 1}}\n\n'.format(
+                self.question.pk
+            ).encode()
+        )
+
+    def test_events_stream_not_found(self):
+        messages = self.stream(0)
+        self.assertEqual(messages[0]["status"], 404)
+
+    def test_wsgi_stops_reconnects(self):
+        response = self.client.get(
+            reverse("question:events", kwargs={"id": self.question.pk})
+        )
+        self.assertEqual(response.status_code, 204)
+        response = self.client.get(self.question.url)
+        self.assertContains(response, "js/question_events.js")
@@ -6,6 +6,7 @@ from . import views
 app_name = 'question'
 tags_patterns = ([
     path("add/", views.add_tag, name="add"),
+    path("search/", views.search_tags, name="search"),
     path("<str:name>/", views.QuestionList.as_view(), name="detail"),
 ], "tag")
 urlpatterns = [
@@ -19,7 +20,9 @@ urlpatterns = [
     ),
     path(
         "hot/",
-        views.QuestionList.as_view(title="Лучшие вопросы"),
+        views.QuestionList.as_view(
+            sort_by_hot=True, title="Лучшие вопросы"
+        ),
         name="hot"
     ),
 
@@ -29,6 +32,11 @@ urlpatterns = [
         views.QuestionDetailView.as_view(),
         name="detail"
     ),
+    path(
+        "question/<int:id>/events/",
+        views.question_events,
+        name="events"
+    ),
     path(
         "question/<int:id>/edit/",
         views.QuestionEditView.as_view(),
@@ -41,6 +49,11 @@ urlpatterns = [
         views.choose_correct_answer,
         name="choose_correct_answer"
     ),
+    path(
+        "search/suggest/",
+        views.search_suggest,
+        name="search_suggest"
+    ),
     path(
         "search/",
         views.QuestionList.as_view(),
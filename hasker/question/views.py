@@ -1,29 +1,106 @@
+import hashlib
+
 from django.shortcuts import redirect, get_object_or_404
 from django.views.generic import (ListView, DetailView,
                                   CreateView, UpdateView)
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, F, Count
 from django.http import (
     HttpResponse, HttpResponseBadRequest,
-    HttpResponseNotAllowed, HttpResponseForbidden
+    HttpResponseNotAllowed, HttpResponseForbidden, Http404, JsonResponse
 )
-from django.urls import resolve
+from django.urls import resolve, reverse
 from django.core.exceptions import PermissionDenied, ObjectDoesNotExist
 from django.core import paginator
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, require_POST
 
+from .cache import get_page_key, get_list_version, get_question_version
 from .models import Question, Answer, Tag
+from .search import search_questions
+from .suggest import get_suggestions
+from .paginator import CachedCountPaginator, KeysetPaginator, is_cursor_mode
 from .forms import QuestionForm, AnswerForm
 
 
+def question_condition(pk_kwarg, per_user=False, representation=None):
+    """
+    condition() decorator with ETag and Last-Modified of the question
+    from pk_kwarg, taken from its updated and last_activity fields.
+    per_user - if response content depends on the current user.
+    representation - function(request) returning parts of ETag for
+    variants of the response (format, query parameters), or None if
+    the response depends on other objects and can't be conditional.
+    """
+    def last_modified(request, *args, **kwargs):
+        if not hasattr(request, "question_last_modified"):
+            request.question_last_modified = None
+            if representation is None or representation(request) is not None:
+                dates = Question.objects.filter(
+                    pk=kwargs[pk_kwarg]
+                ).values_list("updated", "last_activity").first()
+                if dates:
+                    request.question_last_modified = max(dates)
+        return request.question_last_modified
+
+    def etag(request, *args, **kwargs):
+        modified = last_modified(request, *args, **kwargs)
+        if modified is None:
+            return None
+
+        parts = [kwargs[pk_kwarg], modified.isoformat()]
+        if per_user:
+            parts.append(request.user.pk)
+        if representation is not None:
+            parts.extend(representation(request))
+        return hashlib.md5(repr(parts).encode()).hexdigest()
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
 # Create your views here.
+@require_POST
+@login_required
 def add_tag(request):
-    tag_val = request.GET.get('tag', None)
-    tag_val = tag_val.lower()
+    tag_val = request.POST.get('tag', "").strip().lower()
+    max_length = Tag._meta.get_field("name").max_length
+    if not tag_val or len(tag_val) > max_length or "," in tag_val:
+        return HttpResponseBadRequest("Некорректный тег")
+
     new_tag = Tag.objects.get_or_create(name=tag_val)
     return HttpResponse(new_tag[0].name)
 
 
+def search_tags(request):
+    """Tag names starting with the prefix, sorted by name"""
+    prefix = request.GET.get("q", "").strip().lower()
+    if not prefix:
+        return JsonResponse({"tags": []})
+
+    tags = Tag.objects.filter(
+        name__startswith=prefix
+    ).order_by("name").values_list("name", flat=True)
+    return JsonResponse({"tags": list(tags[:settings.TAG_SEARCH_LIMIT])})
+
+
+def search_suggest(request):
+    phrase = request.GET.get("q", "")
+    questions, tags = get_suggestions(phrase)
+    return JsonResponse({
+        "questions": [
+            {
+                "id": pk,
+                "title": title,
+                "url": reverse("question:detail", kwargs={"id": pk}),
+            }
+            for pk, title in questions
+        ],
+        "tags": tags,
+    })
+
+
 def choose_correct_answer(request, a_id):
     try:
         answer = Answer.objects.get(pk=a_id)
@@ -31,7 +108,8 @@ def choose_correct_answer(request, a_id):
         return HttpResponseBadRequest()
 
     answer.question.correct_answer = answer
-    answer.question.save()
+    # Counters of the question are updated by queries meanwhile
+    answer.question.save(update_fields=["correct_answer", "updated"])
 
     return redirect(answer.question.url)
 
@@ -75,15 +153,55 @@ def vote(request):
     return HttpResponse(obj.votes)
 
 
-class QuestionList(ListView):
+def question_events(request, id):
+    """
+    Live events of the question are streamed in ASGI mode only
+    (see question.aio.question_events), "No Content" stops
+    EventSource reconnects, so a stream never holds a WSGI worker
+    """
+    return HttpResponse(status=204)
+
+
+class AnonymousPageCacheMixin:
+    """
+    Cache whole rendered GET pages for anonymous users.
+    Cache key includes full url (with page number) and content version
+    from get_page_cache_version(), bumped on writes by receivers.
+    """
+    page_cache_timeout = settings.PAGE_CACHE_TIMEOUT
+
+    def get_page_cache_version(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != "GET" or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+
+        key = get_page_key(request, self.get_page_cache_version())
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, "render"):
+            response.add_post_render_callback(
+                lambda r: cache.set(key, r, self.page_cache_timeout)
+            )
+        return response
+
+
+class QuestionList(AnonymousPageCacheMixin, ListView):
     context_object_name = 'questions'
     template_name = "question/list.html"
+    replica_reads = True
 
     title = ""
     search_phrase = ""
     tag_name = ""
     sort_by_date = False
+    sort_by_hot = False
     paginate_by = settings.PAGINATE_QUESTIONS
+    paginator_class = CachedCountPaginator
 
     def dispatch(self, request, *args, **kwargs):
         url_name = resolve(self.request.path).url_name
@@ -105,58 +223,95 @@ class QuestionList(ListView):
 
     def get_queryset(self):
         if self.search_phrase:
-            questions = Question.objects.filter(
-                Q(title__icontains=self.search_phrase) |
-                Q(text__icontains=self.search_phrase)
-            )
+            # Search results are ordered by relevance
+            questions = search_questions(self.search_phrase)
+            return questions.select_related("author").prefetch_related("tags")
         elif self.tag_name:
             tag = get_object_or_404(Tag, name=self.tag_name)
             questions = tag.questions
         else:
             questions = Question.objects.all()
 
-        if not self.sort_by_date:
-            questions = questions.annotate(
-                likes=Count("likers"),
-                dislikes=Count("dislikers"),
-            ).order_by(F("dislikes") - F("likes"), "-published")
+        if self.sort_by_hot:
+            questions = questions.order_by("-hot_score", "-published")
+        elif not self.sort_by_date:
+            questions = questions.order_by("-score", "-published")
+
+        return questions.select_related("author").prefetch_related("tags")
+
+    def paginate_queryset(self, queryset, page_size):
+        if not is_cursor_mode(self.request.GET):
+            return super().paginate_queryset(queryset, page_size)
 
-        return questions
+        try:
+            page = KeysetPaginator(queryset, page_size).page(
+                self.request.GET.get("cursor")
+            )
+        except paginator.InvalidPage as e:
+            raise Http404(str(e))
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_page_cache_version(self):
+        return get_list_version()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context["cursor_pagination"] = is_cursor_mode(self.request.GET)
         context["title"] = self.title
         context["tag"] = self.tag_name
         context["search_phrase"] = self.search_phrase
         return context
 
 
-class QuestionDetailView(DetailView):
-    model = Question
+class QuestionDetailView(AnonymousPageCacheMixin, DetailView):
+    queryset = Question.objects.select_related(
+        "author"
+    ).prefetch_related("tags")
     object = None
     template_name = "question/detail.html"
     context_object_name = "question"
     pk_url_kwarg = "id"
+    replica_reads = True
 
     answers_paginate_by = settings.PAGINATE_ANSWERS
 
+    @method_decorator(question_condition("id", per_user=True))
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_page_cache_version(self):
+        return get_question_version(self.kwargs[self.pk_url_kwarg])
+
+    def get_answers_queryset(self):
+        return self.object.answers.select_related(
+            "author"
+        ).order_by("-score", "-published")
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        answers_page = self.request.GET.get("page", 1)
-        answers = self.object.answers.all().annotate(
-            likes=Count("likers"),
-            dislikes=Count("dislikers"),
-        ).order_by(F("dislikes") - F("likes"), "-published")
-        answers_paginator = paginator.Paginator(
-            answers, self.answers_paginate_by
-        )
-        # Catch invalid page numbers
+        answers = self.get_answers_queryset()
+
+        if is_cursor_mode(self.request.GET):
+            answers_paginator = KeysetPaginator(
+                answers, self.answers_paginate_by
+            )
+            answers_page = self.request.GET.get("cursor")
+            first_page = None
+        else:
+            answers_paginator = CachedCountPaginator(
+                answers, self.answers_paginate_by,
+                count=self.object.answers_count
+            )
+            answers_page = self.request.GET.get("page", 1)
+            first_page = 1
+        # Catch invalid page numbers and cursors
         try:
             answers_page_obj = answers_paginator.page(answers_page)
-        except (paginator.PageNotAnInteger, paginator.EmptyPage):
-            answers_page_obj = answers_paginator.page(1)
+        except paginator.InvalidPage:
+            answers_page_obj = answers_paginator.page(first_page)
 
+        context["cursor_pagination"] = is_cursor_mode(self.request.GET)
         context["answers_page_obj"] = answers_page_obj
         context["answers"] = answers_page_obj.object_list
         context["form"] = AnswerForm()
@@ -178,6 +333,7 @@ class QuestionDetailView(DetailView):
                 author=request.user,
                 question=self.object
             )
+            self.object.refresh_from_db(fields=["answers_count"])
             redirect(request.path)
 
         context = self.get_context_data(object=self.object)
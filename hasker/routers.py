@@ -0,0 +1,83 @@
+"""
+Primary/replica database routing.
+
+Reads go to a random DATABASE_REPLICAS alias only inside GET/HEAD
+requests to views with replica_reads = True, everything else
+uses "default". After a write request the client gets a cookie,
+which pins its reads to primary for REPLICA_PIN_SECONDS, so it sees
+its own votes, questions and answers despite replication lag.
+"""
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "db_primary_pin"
+SAFE_METHODS = ("GET", "HEAD")
+
+_state = threading.local()
+
+
+def replica_reads_allowed():
+    return getattr(_state, "replica_reads", False)
+
+
+class ReplicaRouter:
+    # Sessions, content types, etc. are always read from primary
+    replica_apps = ("question", "user")
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        replicas = settings.DATABASE_REPLICAS
+        if (replicas and replica_reads_allowed() and
+                model._meta.app_label in self.replica_apps):
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Following reads of this request must see the write
+        _state.replica_reads = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas have the same data as primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Operations marked as data migrations change rows only on
+        # primary, replicas get them by replication
+        if hints.get("data_migration") and db != DEFAULT_DB_ALIAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.replica_reads = False
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.replica_reads = False
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE, "1", max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, "view_class", view_func)
+        _state.replica_reads = (
+            request.method in SAFE_METHODS and
+            getattr(view, "replica_reads", False) and
+            PIN_COOKIE not in request.COOKIES
+        )
@@ -56,12 +56,19 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'hasker.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'hasker.urls'
 
+DATABASE_ROUTERS = ['hasker.routers.ReplicaRouter']
+# Aliases of "default" read replicas, used by views with replica_reads
+DATABASE_REPLICAS = []
+# Reads of a client go to primary for this time after its write
+REPLICA_PIN_SECONDS = 10
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -79,6 +86,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'hasker.wsgi.application'
+# Threads running blocking code (WSGI app, ORM calls) in ASGI mode
+ASGI_THREADS = 10
 
 
 # Password validation
@@ -100,6 +109,17 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache
+# https://docs.djangoproject.com/en/2.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hasker',
+    }
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/2.0/topics/i18n/
 
@@ -137,9 +157,59 @@ CRISPY_TEMPLATE_PACK = 'bootstrap3'
 PAGINATE_ANSWERS = 30
 PAGINATE_QUESTIONS = 20
 
+# Hot questions rank: (score + 1) / (age_hours + AGE_OFFSET) ^ GRAVITY
+HOT_SCORE_GRAVITY = 1.8
+HOT_SCORE_AGE_OFFSET = 2  # hours
+
+TOP_QUESTIONS_CACHE_TIMEOUT = 60  # seconds, max staleness of sidebar
+PAGE_CACHE_TIMEOUT = 60  # seconds, max staleness of anonymous pages
+QUESTION_SUMMARY_CACHE_TIMEOUT = 60 * 60 * 24
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 30  # seconds
+# Use planner rows estimate instead of COUNT(*) above it (PostgreSQL only)
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 100000
+# "pages" - page numbers, "cursor" - keyset pagination without counts,
+# also used for requests with "cursor" query param
+PAGINATION_MODE = "pages"
+
+# Dotted path of question search backend class,
+# None - full-text search of the database (SQLite FTS5 or PostgreSQL)
+SEARCH_BACKEND = None
+
+# Search-as-you-type suggestions: number of titles and tags
+# and rebuild period of in-memory index
+SUGGEST_LIMIT = 10
+SUGGEST_INDEX_MAX_AGE = 300  # seconds
+
+# Number of tags in tag autocomplete
+TAG_SEARCH_LIMIT = 10
+
 MAX_FILE_SIZE = 307200  # 300KB
+# Compressed images may be small files with huge decoded size
+AVATAR_MAX_PIXELS = 4096 * 4096
+
+MAX_BATCH_VOTES = 100  # operations per API batch vote request
 
 TECH_EMAIL = "noreply@hasker.ru"
+# Absolute links in emails, which are sent outside of requests
+SITE_URL = "http://localhost:8000"
+
+# Answer notifications outbox: failed email is retried after
+# NOTIFICATION_RETRY_DELAY * 2 ** (attempts - 1) seconds,
+# claimed batch is hidden from other workers for NOTIFICATION_CLAIM_TIMEOUT
+NOTIFICATION_MAX_ATTEMPTS = 5
+NOTIFICATION_RETRY_DELAY = 60  # seconds
+NOTIFICATION_CLAIM_TIMEOUT = 300  # seconds
+# At most one email per recipient and question in this time,
+# answers received meanwhile are sent in one digest
+NOTIFICATION_DIGEST_WINDOW = 600  # seconds
+# Sent notifications are deleted after this time (longer than the window)
+NOTIFICATION_KEEP_SENT = 7 * 24 * 3600  # seconds
+
+# Live question page events (ASGI mode only)
+EVENTS_BROKER = "hasker.question.events.LocalBroker"
+EVENTS_QUEUE_SIZE = 100  # undelivered events per stream
+EVENTS_KEEPALIVE = 15  # seconds between comments on idle streams
 
 
 # DRF API
@@ -153,7 +223,7 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'PAGE_SIZE': PAGINATE_QUESTIONS,
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination'
+    'DEFAULT_PAGINATION_CLASS': 'hasker.api.pagination.CachedCountPagination'
 }
 
 # DRF SIMPLE JWT
@@ -18,7 +18,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': root('db.sqlite3'),
-    }
+    },
+    # Local replica to try routing: copy db.sqlite3 to db_replica.sqlite3
+    # and set DATABASE_REPLICAS = ["replica"]
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': root('db_replica.sqlite3'),
+    },
 }
 
 STATIC_ROOT = root('static/')
@@ -12,6 +12,7 @@ ALLOWED_HOSTS = ['*']
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = root("tmp", "emails")
+SITE_URL = os.environ.get('SITE_URL', 'https://hasker.ru')
 
 MEDIA_ROOT = '/var/www/media/'
 STATIC_ROOT = '/var/www/static/'
@@ -27,3 +28,10 @@ DATABASES = {
         'PORT': '',
     }
 }
+
+# Comma separated hosts of streaming replicas
+for i, host in enumerate(filter(None, os.environ.get(
+        'DB_REPLICA_HOSTS', '').split(','))):
+    alias = 'replica_{}'.format(i)
+    DATABASES[alias] = dict(DATABASES['default'], HOST=host.strip())
+    DATABASE_REPLICAS.append(alias)
@@ -0,0 +1,30 @@
+// Live scores and new answers of the question page (Server-Sent Events)
+$(document).ready(function () {
+    let question = $(".qa_detail[data-events-url]");
+    if (!question.length || !window.EventSource) {
+        return;
+    }
+
+    let source = new EventSource(question.data("events-url"));
+
+    source.addEventListener("score", function (event) {
+        let data = JSON.parse(event.data);
+        $("#" + data.id + " .qa_rate > span:not(.a_correct)").text(data.score);
+    });
+
+    source.addEventListener("answer", function (event) {
+        let data = JSON.parse(event.data);
+        if ($("#" + data.id).length) {
+            return;
+        }
+
+        let answers = $(".qa_answers");
+        if (!answers.length) {
+            answers = $("<div class='qa_answers'>").append(
+                $("<h3 class='answers_header'>").text("Ответы")
+            );
+            question.after(answers);
+        }
+        answers.append(data.html);
+    });
+});
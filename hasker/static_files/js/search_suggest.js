@@ -0,0 +1,32 @@
+// Search-as-you-type: fill datalist of the header search input
+$(document).ready(function () {
+    let input = $("header form.search input[name=q]");
+    let datalist = $("#search_suggestions");
+    let timer = null;
+
+    input.on("input", function () {
+        clearTimeout(timer);
+        let phrase = input.val();
+        if (!phrase || phrase.startsWith("tag:")) {
+            datalist.empty();
+            return;
+        }
+
+        timer = setTimeout(function () {
+            $.ajax({
+                url: input.data("suggest-url"),
+                dataType: "json",
+                data: {"q": phrase},
+                success: function (data) {
+                    datalist.empty();
+                    data.questions.forEach(function (question) {
+                        datalist.append($("<option>").val(question.title));
+                    });
+                    data.tags.forEach(function (tag) {
+                        datalist.append($("<option>").val("tag:" + tag));
+                    });
+                }
+            });
+        }, 150);
+    });
+});
@@ -0,0 +1,100 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Square sizes of avatar variants in pixels
+AVATAR_SIZES = (32, 64, 256)
+# (file extension, Pillow format, save options)
+AVATAR_FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 6}),
+    ("jpg", "JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+)
+THUMBNAILS_DIR = "thumbs"
+
+
+def thumbnail_name(avatar_name, size, extension):
+    """
+    avatars/photo.png -> avatars/thumbs/photo.png_32.webp, full avatar
+    name keeps variants of photo.png and photo.jpg apart
+    """
+    directory, filename = os.path.split(avatar_name)
+    return os.path.join(
+        directory, THUMBNAILS_DIR, "{}_{}.{}".format(filename, size, extension)
+    )
+
+
+def thumbnail_url(avatar, size, extension):
+    return avatar.storage.url(thumbnail_name(avatar.name, size, extension))
+
+
+def to_rgb(image):
+    """JPEG has no alpha channel: transparent parts become white"""
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    return image.convert("RGB")
+
+
+def check_pixels(image):
+    """Header size of huge images is rejected before they are decoded"""
+    width, height = image.size
+    if width * height > settings.AVATAR_MAX_PIXELS:
+        raise ValueError("Image is too large: {}x{}".format(width, height))
+
+
+def generate_thumbnails(avatar):
+    """Save square center-cropped variants of every size and format"""
+    with avatar.open("rb") as f:
+        image = Image.open(f)
+        check_pixels(image)
+        # JPEG is decoded at the smallest scale not less than needed
+        image.draft("RGB", (AVATAR_SIZES[-1], AVATAR_SIZES[-1]))
+        image = to_rgb(ImageOps.exif_transpose(image))
+
+    storage = avatar.storage
+    for size in AVATAR_SIZES:
+        thumbnail = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        for extension, image_format, options in AVATAR_FORMATS:
+            content = BytesIO()
+            thumbnail.save(content, image_format, **options)
+
+            name = thumbnail_name(avatar.name, size, extension)
+            # Names are derived from avatar name, so replace old files
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(content.getvalue()))
+
+
+def delete_thumbnails(avatar):
+    """Delete variants of the replaced or cleared avatar"""
+    for size in AVATAR_SIZES:
+        for extension, image_format, options in AVATAR_FORMATS:
+            name = thumbnail_name(avatar.name, size, extension)
+            if avatar.storage.exists(name):
+                avatar.storage.delete(name)
+
+
+def update_avatar_thumbnails(user):
+    """
+    Generate variants of the uploaded avatar and save the flag,
+    which makes templates use them
+    """
+    has_thumbnails = False
+    if user.avatar:
+        try:
+            generate_thumbnails(user.avatar)
+        except (OSError, ValueError):
+            # Not an image Pillow can convert, original avatar is used
+            pass
+        else:
+            has_thumbnails = True
+
+    if user.avatar_thumbnails != has_thumbnails:
+        user.avatar_thumbnails = has_thumbnails
+        user.save(update_fields=["avatar_thumbnails"])
+    return has_thumbnails
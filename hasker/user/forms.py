@@ -9,6 +9,7 @@ from django.core.files.images import ImageFile
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Submit
 
+from .avatars import delete_thumbnails, update_avatar_thumbnails
 from .models import User
 
 
@@ -31,8 +32,30 @@ class UserMixin:
                 },
                 code="exceeding_file_size"
             )
+        # Image opened by the form field, its pixels aren't decoded yet
+        image = getattr(content, "image", None)
+        if image and image.width * image.height > settings.AVATAR_MAX_PIXELS:
+            raise ValidationError(
+                "Размер изображения: %(width)sx%(height)s пикселей. "
+                "Максимально допустимо: %(max_pixels)s пикселей.",
+                params={
+                    "width": image.width,
+                    "height": image.height,
+                    "max_pixels": settings.AVATAR_MAX_PIXELS
+                },
+                code="exceeding_image_size"
+            )
         return content
 
+    def save(self, commit=True):
+        old_avatar = self.initial.get("avatar")
+        user = super().save(commit)
+        if commit and "avatar" in self.changed_data:
+            if old_avatar:
+                delete_thumbnails(old_avatar)
+            update_avatar_thumbnails(user)
+        return user
+
 
 class UserSignupForm(UserMixin, UserCreationForm):
     email = EmailField(required=True)
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from hasker.user.avatars import update_avatar_thumbnails
+from hasker.user.models import User
+
+
+class Command(BaseCommand):
+    help = "Generate pre-sized variants of avatars uploaded before them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate variants of all avatars",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(avatar="").exclude(avatar=None).only(
+            "pk", "avatar", "avatar_thumbnails"
+        ).order_by("pk")
+        if not options["all"]:
+            users = users.filter(avatar_thumbnails=False)
+
+        built = failed = 0
+        for user in users.iterator():
+            if update_avatar_thumbnails(user):
+                built += 1
+            else:
+                failed += 1
+                self.stderr.write(
+                    "Can't process avatar of user #{}: {}".format(
+                        user.pk, user.avatar.name
+                    )
+                )
+
+        self.stdout.write("Built thumbnails of {} avatars, {} failed".format(
+            built, failed
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_thumbnails',
+            field=models.BooleanField(default=False, verbose_name='Превью аватарки'),
+        ),
+    ]
@@ -10,6 +10,10 @@ class User(AbstractUser):
         verbose_name="Аватарка", upload_to="avatars",
         blank=True, null=True
     )
+    # Pre-sized variants of avatar are generated (see avatars.py)
+    avatar_thumbnails = models.BooleanField(
+        "Превью аватарки", default=False
+    )
 
     def get_absolute_url(self):
         return reverse('user:profile', kwargs={'username': self.username})
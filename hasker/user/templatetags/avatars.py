@@ -0,0 +1,41 @@
+from django import template
+from django.templatetags.static import static
+
+from ..avatars import AVATAR_SIZES, thumbnail_url
+
+register = template.Library()
+
+
+def srcset(avatar, sizes, extension):
+    return ", ".join(
+        "{} {}x".format(thumbnail_url(avatar, size, extension), density)
+        for density, size in enumerate(sizes, 1)
+    )
+
+
+@register.inclusion_tag("user/avatar.html")
+def avatar(user, size):
+    """
+    Avatar image of size x size pixels: the smallest pre-sized variant
+    not less than size (and double size one for HiDPI screens),
+    WebP with JPEG fallback. Original avatar is used without variants.
+    """
+    context = {"size": size, "webp_srcset": None, "jpg_srcset": None}
+    if not user.avatar:
+        context["src"] = static("img/default_avatar.png")
+        return context
+    if not user.avatar_thumbnails:
+        context["src"] = user.avatar.url
+        return context
+
+    sizes = []
+    for density in (1, 2):
+        fitting = [s for s in AVATAR_SIZES if s >= size * density]
+        variant = fitting[0] if fitting else AVATAR_SIZES[-1]
+        if variant not in sizes:
+            sizes.append(variant)
+
+    context["src"] = thumbnail_url(user.avatar, sizes[0], "jpg")
+    context["webp_srcset"] = srcset(user.avatar, sizes, "webp")
+    context["jpg_srcset"] = srcset(user.avatar, sizes, "jpg")
+    return context
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from hasker.user.avatars import AVATAR_SIZES, thumbnail_name
+from hasker.user.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(size=(400, 300), image_format="PNG", mode="RGBA"):
+    content = BytesIO()
+    Image.new(mode, size, (255, 0, 0, 128)[:len(mode)]).save(
+        content, image_format
+    )
+    return content.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AvatarThumbnailsTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", email="user@mail.com", password="password"
+        )
+        self.client.login(username="user", password="password")
+
+    def upload_avatar(self, content, name="avatar.png"):
+        return self.client.post(reverse("user:edit"), {
+            "email": "user@mail.com",
+            "avatar": SimpleUploadedFile(name, content),
+        })
+
+    def assert_thumbnails(self, avatar_name):
+        for size in AVATAR_SIZES:
+            for extension in ("webp", "jpg"):
+                path = os.path.join(
+                    MEDIA_ROOT, thumbnail_name(avatar_name, size, extension)
+                )
+                with Image.open(path) as image:
+                    self.assertEqual(image.size, (size, size))
+
+    def test_upload_builds_thumbnails(self):
+        self.upload_avatar(make_image())
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.avatar_thumbnails)
+        self.assert_thumbnails(self.user.avatar.name)
+
+        response = self.client.get(self.user.url)
+        self.assertContains(response, 'type="image/webp"')
+        self.assertContains(
+            response, thumbnail_name(self.user.avatar.name, 256, "jpg")
+        )
+
+    def test_avatar_without_thumbnails(self):
+        response = self.client.get(self.user.url)
+        self.assertContains(response, "img/default_avatar.png")
+
+        self.user.avatar = SimpleUploadedFile("old.jpg", make_image(
+            image_format="JPEG", mode="RGB"
+        ))
+        self.user.save()
+        response = self.client.get(self.user.url)
+        self.assertContains(response, self.user.avatar.url)
+        self.assertNotContains(response, 'type="image/webp"')
+
+    def test_backfill_command(self):
+        self.user.avatar = SimpleUploadedFile("old.jpg", make_image(
+            image_format="JPEG", mode="RGB"
+        ))
+        self.user.save()
+
+        call_command("build_avatar_thumbnails", stdout=StringIO())
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.avatar_thumbnails)
+        self.assert_thumbnails(self.user.avatar.name)
+
+    def test_variants_of_same_stem_dont_collide(self):
+        self.assertNotEqual(
+            thumbnail_name("avatars/photo.png", 32, "webp"),
+            thumbnail_name("avatars/photo.jpg", 32, "webp")
+        )
+
+    def test_replace_avatar_deletes_old_variants(self):
+        self.upload_avatar(make_image())
+        self.user.refresh_from_db()
+        old_name = self.user.avatar.name
+
+        self.upload_avatar(make_image(), name="new.png")
+        self.user.refresh_from_db()
+        self.assert_thumbnails(self.user.avatar.name)
+        for size in AVATAR_SIZES:
+            self.assertFalse(os.path.exists(os.path.join(
+                MEDIA_ROOT, thumbnail_name(old_name, size, "webp")
+            )))
+
+        self.client.post(reverse("user:edit"), {
+            "email": "user@mail.com", "avatar-clear": "on",
+        })
+        self.assertFalse(os.path.exists(os.path.join(
+            MEDIA_ROOT, thumbnail_name(self.user.avatar.name, 32, "jpg")
+        )))
+
+    @override_settings(AVATAR_MAX_PIXELS=100 * 100)
+    def test_too_many_pixels(self):
+        response = self.upload_avatar(make_image())
+        self.assertFormError(
+            response, "form", "avatar",
+            "Размер изображения: 400x300 пикселей. "
+            "Максимально допустимо: 10000 пикселей."
+        )
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.avatar)
+
+        # Avatars saved without the form are skipped by the command
+        self.user.avatar = SimpleUploadedFile("old.png", make_image())
+        self.user.save()
+        call_command(
+            "build_avatar_thumbnails", stdout=StringIO(), stderr=StringIO()
+        )
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.avatar_thumbnails)
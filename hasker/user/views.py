@@ -65,3 +65,12 @@ class UserDetailView(DetailView):
     context_object_name = "user"
     slug_url_kwarg = "username"
     slug_field = "username"
+    replica_reads = True
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["questions"] = self.object.question_set.all()[:10]
+        context["answers"] = self.object.answer_set.select_related(
+            "question"
+        )[:10]
+        return context
@@ -16,3 +16,6 @@ os.environ.setdefault(
 )
 
 application = get_wsgi_application()
+
+from hasker.question.suggest import preload_suggest_index  # noqa: E402
+preload_suggest_index()